@@ -0,0 +1,27 @@
+"""Add prefix index for agent name suggestions
+
+Revision ID: add_agent_name_prefix_index
+Revises: add_agent_search_indexes
+Create Date: 2026-10-17
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_agent_name_prefix_index"
+down_revision: str | Sequence[str] | None = "add_agent_search_indexes"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add a lower(name) text_pattern_ops index for LIKE 'query%' suggestions."""
+    op.execute("CREATE INDEX ix_agents_name_prefix ON agents (lower(name) text_pattern_ops)")
+
+
+def downgrade() -> None:
+    """Remove agent name prefix index."""
+    op.drop_index("ix_agents_name_prefix", table_name="agents")
@@ -0,0 +1,38 @@
+"""Add trigram indexes for user search
+
+Revision ID: add_user_search_indexes
+Revises: add_agent_name_prefix_index
+Create Date: 2026-10-17
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_user_search_indexes"
+down_revision: str | Sequence[str] | None = "add_agent_name_prefix_index"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SEARCH_COLUMNS = ("username", "bio")
+
+
+def upgrade() -> None:
+    """Add pg_trgm GIN indexes so ILIKE '%query%' user searches avoid full scans."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in SEARCH_COLUMNS:
+        op.create_index(
+            f"ix_users_{column}_trgm",
+            "users",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Remove user search trigram indexes."""
+    for column in SEARCH_COLUMNS:
+        op.drop_index(f"ix_users_{column}_trgm", table_name="users")
@@ -13,6 +13,7 @@ from agent_marketplace_api.database import get_db
 from agent_marketplace_api.models import Agent, Category, User, agent_categories
 from agent_marketplace_api.models.agent import AgentVersion
 from agent_marketplace_api.schemas.user import UserSummary
+from agent_marketplace_api.services.search_service import invalidate_search_cache
 
 router = APIRouter()
 
@@ -331,6 +332,7 @@ async def update_agent_admin(
             new_category.agent_count += 1
 
     await db.commit()
+    invalidate_search_cache()
     await db.refresh(agent)
 
     # Reload categories and versions
@@ -390,6 +392,7 @@ async def delete_agent_admin(
 
     await db.delete(agent)
     await db.commit()
+    invalidate_search_cache()
 
 
 @router.post("/agents/bulk-category", response_model=BulkUpdateResponse)
@@ -730,3 +733,4 @@ async def delete_user_admin(
 
     await db.delete(user)
     await db.commit()
+    invalidate_search_cache()  # the user's agents were deleted with them
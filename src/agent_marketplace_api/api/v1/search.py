@@ -49,6 +49,9 @@ async def search_agents(
     ),
     limit: int = Query(20, ge=1, le=100, description="Results per page"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
+    include_total: bool = Query(
+        True, description="Count all matches; disable for infinite scroll (total is null)"
+    ),
 ) -> AgentSearchResponse:
     """
     Search agents by name and description, or browse by category.
@@ -64,6 +67,7 @@ async def search_agents(
         sort=sort,
         limit=limit,
         offset=offset,
+        include_total=include_total,
     )
 
     return AgentSearchResponse(
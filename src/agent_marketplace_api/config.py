@@ -39,6 +39,7 @@ class Settings(BaseSettings):
     s3_secret_key: str = "minioadmin"
     s3_bucket: str = "agent-marketplace"
     s3_region: str = "us-east-1"
+    s3_max_pool_connections: int = 64
 
     # JWT
     jwt_secret_key: str = "change-me-in-production"
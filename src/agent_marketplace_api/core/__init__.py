@@ -13,6 +13,7 @@ from agent_marketplace_api.core.metrics import (
     VALIDATION_DURATION_SECONDS,
     MetricsMiddleware,
     get_metrics,
+    get_metrics_cached,
     track_agent_download,
     track_agent_upload,
     track_review,
@@ -36,6 +37,7 @@ __all__ = [
     "USERS_GAUGE",
     "VALIDATION_DURATION_SECONDS",
     "get_metrics",
+    "get_metrics_cached",
     "track_agent_download",
     "track_agent_upload",
     "track_review",
@@ -1,7 +1,10 @@
 """Prometheus metrics for monitoring and observability."""
 
+import re
 import time
+from collections import deque
 from collections.abc import Awaitable, Callable
+from functools import lru_cache
 
 from fastapi import Request, Response
 from prometheus_client import (
@@ -13,7 +16,7 @@ from prometheus_client import (
     generate_latest,
 )
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 # Create a custom registry for testing isolation
 REGISTRY = CollectorRegistry()
@@ -94,6 +97,149 @@ VALIDATION_DURATION_SECONDS = Histogram(
 )
 
 
+class BufferedCounter:
+    """
+    Batch labelled increments before applying them to a Counter.
+
+    Writers only append to a deque, whose append/popleft are atomic, so the
+    request path takes no lock. Pending increments are summed per label set
+    and applied every ``flush_every`` increments and whenever metrics are read.
+    """
+
+    def __init__(self, counter: Counter, flush_every: int = 64) -> None:
+        """Initialize buffer for a labelled counter."""
+        self._counter = counter
+        self._flush_every = flush_every
+        self._pending: deque[tuple[tuple[str, ...], float]] = deque()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """Record an increment for the given label values, in label order."""
+        self._pending.append((label_values, amount))
+        if len(self._pending) >= self._flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Apply all pending increments to the counter."""
+        pending = self._pending
+        totals: dict[tuple[str, ...], float] = {}
+        while pending:
+            try:
+                label_values, amount = pending.popleft()
+            except IndexError:  # drained concurrently by another flush
+                break
+            totals[label_values] = totals.get(label_values, 0) + amount
+        for label_values, amount in totals.items():
+            self._counter.labels(*label_values).inc(amount)
+
+
+class BufferedHistogram:
+    """
+    Queue labelled observations and apply them to a Histogram in batches.
+
+    Uses the same lock-free deque as BufferedCounter. Observations are
+    replayed one by one, since bucket counts cannot be merged by summing,
+    but each label set is resolved only once per flush.
+    """
+
+    def __init__(self, histogram: Histogram, flush_every: int = 64) -> None:
+        """Initialize buffer for a labelled histogram."""
+        self._histogram = histogram
+        self._flush_every = flush_every
+        self._pending: deque[tuple[tuple[str, ...], float]] = deque()
+
+    def observe(self, *label_values: str, value: float) -> None:
+        """Record an observation for the given label values, in label order."""
+        self._pending.append((label_values, value))
+        if len(self._pending) >= self._flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Apply all pending observations to the histogram."""
+        pending = self._pending
+        children: dict[tuple[str, ...], Histogram] = {}
+        while pending:
+            try:
+                label_values, value = pending.popleft()
+            except IndexError:  # drained concurrently by another flush
+                break
+            child = children.get(label_values)
+            if child is None:
+                child = children[label_values] = self._histogram.labels(*label_values)
+            child.observe(value)
+
+
+# Per-request metrics, buffered so the middleware does not take the metric
+# locks on every request
+_HTTP_REQUESTS_BUFFER = BufferedCounter(HTTP_REQUESTS_TOTAL)
+_HTTP_DURATION_BUFFER = BufferedHistogram(HTTP_REQUEST_DURATION_SECONDS)
+_VALIDATION_DURATION_BUFFER = BufferedHistogram(VALIDATION_DURATION_SECONDS)
+
+# Buffers drained before every read; new module-level buffers must be listed here
+_BUFFERED_METRICS: tuple[BufferedCounter | BufferedHistogram, ...] = (
+    _HTTP_REQUESTS_BUFFER,
+    _HTTP_DURATION_BUFFER,
+    _VALIDATION_DURATION_BUFFER,
+)
+
+
+def _flush_all() -> None:
+    """Flush every buffered metric so reads see all recorded samples."""
+    for buffered in _BUFFERED_METRICS:
+        buffered.flush()
+
+
+# Pre-resolved label children for the fixed-label business counters and
+# gauges. The hot paths skip the labels() lookup and its lock, and every known
+# series is exported (as zero) from the first scrape of a fresh worker.
+_UPLOAD_SUCCESS = AGENT_UPLOADS_TOTAL.labels(status="success")
+_UPLOAD_FAILURE = AGENT_UPLOADS_TOTAL.labels(status="failure")
+_REVIEW_CHILDREN = {rating: REVIEWS_TOTAL.labels(rating=str(rating)) for rating in range(1, 6)}
+_STAR_CHILDREN = {
+    "star": STARS_TOTAL.labels(operation="star"),
+    "unstar": STARS_TOTAL.labels(operation="unstar"),
+}
+_AGENT_GAUGE_TOTAL = AGENTS_GAUGE.labels(status="total")
+_AGENT_GAUGE_VALIDATED = AGENTS_GAUGE.labels(status="validated")
+_AGENT_GAUGE_PENDING = AGENTS_GAUGE.labels(status="pending")
+_USER_GAUGE_TOTAL = USERS_GAUGE.labels(status="total")
+_USER_GAUGE_ACTIVE = USERS_GAUGE.labels(status="active")
+
+
+@lru_cache(maxsize=4096)
+def _download_child(agent_slug: str) -> Counter:
+    """Get the cached download counter child for an agent slug."""
+    return AGENT_DOWNLOADS_TOTAL.labels(agent_slug=agent_slug)
+
+
+# Collections whose next path segment is a slug or ID, and the sub-resource
+# keywords that may follow a collection without being a slug
+_COLLECTIONS = ("agents", "users", "reviews", "categories")
+_KEYWORDS = ("star", "reviews", "versions", "download", "stats")
+
+# The keyword-vs-slug decision is compiled into one alternation at import. A
+# segment directly after a collection is a slug unless it is numeric or a
+# keyword. Lookbehinds check the raw previous segment, so chained
+# collections like /agents/reviews/5 resolve the same way a
+# segment-by-segment scan would.
+_SLUG_SEGMENT_RE = re.compile(
+    "(?:" + "|".join(f"(?<=/{re.escape(name)}/)" for name in _COLLECTIONS) + ")"
+    r"(?!(?:" + "|".join(map(re.escape, _KEYWORDS)) + r"|\d+)(?:/|$))[^/]+"
+)
+_ID_SEGMENT_RE = re.compile(r"(?<=/)\d+(?=/|$)")
+
+
+@lru_cache(maxsize=2048)
+def _normalize_path(path: str) -> str:
+    """Replace slug and ID path segments with placeholders."""
+    if not path.startswith("/"):
+        path = "/" + path
+    normalized = _ID_SEGMENT_RE.sub("{id}", _SLUG_SEGMENT_RE.sub("{slug}", path))
+    if "//" in normalized or normalized.endswith("/"):
+        # Drop empty segments so "/a//b/" and "/a/b" share one label
+        normalized = "/" + "/".join(part for part in normalized.split("/") if part)
+    return normalized
+
+
 class MetricsMiddleware(BaseHTTPMiddleware):
     """Middleware to track HTTP request metrics."""
 
@@ -101,19 +247,23 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         """Initialize metrics middleware."""
         super().__init__(app)
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Pass the metrics endpoint straight through, before any Request is built."""
+        # Skip metrics endpoint to avoid recursion
+        if scope["type"] == "http" and scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
     async def dispatch(
         self,
         request: Request,
         call_next: Callable[[Request], Awaitable[Response]],
     ) -> Response:
         """Track request metrics."""
-        # Skip metrics endpoint to avoid recursion
-        if request.url.path == "/metrics":
-            return await call_next(request)
-
         method = request.method
-        # Normalize path to avoid high cardinality
-        endpoint = self._normalize_path(request.url.path)
+        # Normalize the raw ASGI path; request.url would rebuild and parse the full URL
+        endpoint = _normalize_path(request.scope["path"])
 
         start_time = time.perf_counter()
 
@@ -127,16 +277,8 @@ class MetricsMiddleware(BaseHTTPMiddleware):
             duration = time.perf_counter() - start_time
 
             # Record metrics
-            HTTP_REQUESTS_TOTAL.labels(
-                method=method,
-                endpoint=endpoint,
-                status=status,
-            ).inc()
-
-            HTTP_REQUEST_DURATION_SECONDS.labels(
-                method=method,
-                endpoint=endpoint,
-            ).observe(duration)
+            _HTTP_REQUESTS_BUFFER.inc(method, endpoint, status)
+            _HTTP_DURATION_BUFFER.observe(method, endpoint, value=duration)
 
         return response
 
@@ -146,28 +288,7 @@ class MetricsMiddleware(BaseHTTPMiddleware):
 
         Replaces dynamic segments (IDs, slugs) with placeholders.
         """
-        parts = path.split("/")
-        normalized_parts = []
-
-        for i, part in enumerate(parts):
-            if not part:
-                continue
-
-            # Check if previous part suggests this is a dynamic segment
-            if i > 0 and parts[i - 1] in ("agents", "users", "reviews", "categories"):
-                # This might be a slug or ID
-                if part.isdigit():
-                    normalized_parts.append("{id}")
-                elif part not in ("star", "reviews", "versions", "download", "stats"):
-                    normalized_parts.append("{slug}")
-                else:
-                    normalized_parts.append(part)
-            elif part.isdigit():
-                normalized_parts.append("{id}")
-            else:
-                normalized_parts.append(part)
-
-        return "/" + "/".join(normalized_parts) if normalized_parts else "/"
+        return _normalize_path(path)
 
 
 def get_metrics() -> tuple[bytes, str]:
@@ -177,46 +298,78 @@ def get_metrics() -> tuple[bytes, str]:
     Returns:
         Tuple of (metrics bytes, content type)
     """
+    _flush_all()
     return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
 
 
+# Last scrape as (monotonic timestamp, content, content type)
+_metrics_cache: tuple[float, bytes, str] | None = None
+
+
+def get_metrics_cached(max_age_ms: int = 250) -> tuple[bytes, str]:
+    """
+    Generate Prometheus metrics output, reusing a recent scrape.
+
+    Caps registry serialization at one per ``max_age_ms`` when several
+    scrapers hit the endpoint at once.
+
+    Args:
+        max_age_ms: Maximum age of a reused scrape in milliseconds
+
+    Returns:
+        Tuple of (metrics bytes, content type)
+    """
+    global _metrics_cache
+    now = time.monotonic()
+    if _metrics_cache is not None and (now - _metrics_cache[0]) * 1000 < max_age_ms:
+        return _metrics_cache[1], _metrics_cache[2]
+    content, content_type = get_metrics()
+    _metrics_cache = (now, content, content_type)
+    return content, content_type
+
+
 def track_agent_upload(success: bool) -> None:
     """Track an agent upload."""
-    status = "success" if success else "failure"
-    AGENT_UPLOADS_TOTAL.labels(status=status).inc()
+    (_UPLOAD_SUCCESS if success else _UPLOAD_FAILURE).inc()
 
 
 def track_agent_download(agent_slug: str) -> None:
     """Track an agent download."""
-    AGENT_DOWNLOADS_TOTAL.labels(agent_slug=agent_slug).inc()
+    _download_child(agent_slug).inc()
 
 
 def track_review(rating: int) -> None:
     """Track a review creation."""
-    REVIEWS_TOTAL.labels(rating=str(rating)).inc()
+    child = _REVIEW_CHILDREN.get(rating)
+    if child is None:
+        child = REVIEWS_TOTAL.labels(rating=str(rating))
+    child.inc()
 
 
 def track_star(operation: str) -> None:
     """Track a star operation (star or unstar)."""
-    STARS_TOTAL.labels(operation=operation).inc()
+    child = _STAR_CHILDREN.get(operation)
+    if child is None:
+        child = STARS_TOTAL.labels(operation=operation)
+    child.inc()
 
 
 def track_validation(validator_type: str, duration: float) -> None:
     """Track validation duration."""
-    VALIDATION_DURATION_SECONDS.labels(validator_type=validator_type).observe(duration)
+    _VALIDATION_DURATION_BUFFER.observe(validator_type, value=duration)
 
 
 def update_agent_gauge(total: int, validated: int, pending: int) -> None:
     """Update agent count gauges."""
-    AGENTS_GAUGE.labels(status="total").set(total)
-    AGENTS_GAUGE.labels(status="validated").set(validated)
-    AGENTS_GAUGE.labels(status="pending").set(pending)
+    _AGENT_GAUGE_TOTAL.set(total)
+    _AGENT_GAUGE_VALIDATED.set(validated)
+    _AGENT_GAUGE_PENDING.set(pending)
 
 
 def update_user_gauge(total: int, active: int) -> None:
     """Update user count gauges."""
-    USERS_GAUGE.labels(status="total").set(total)
-    USERS_GAUGE.labels(status="active").set(active)
+    _USER_GAUGE_TOTAL.set(total)
+    _USER_GAUGE_ACTIVE.set(active)
 
 
 def update_pending_validations_gauge(count: int) -> None:
@@ -238,6 +391,7 @@ def get_metric_value(
     Returns:
         Current metric value
     """
+    _flush_all()
     if labels:
         # For labeled metrics
         try:
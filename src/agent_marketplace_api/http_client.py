@@ -0,0 +1,39 @@
+"""Shared HTTP client pool for outbound requests."""
+
+from typing import Any
+
+import httpx
+
+
+class HTTPClientPool:
+    """Holds one long-lived AsyncClient so connections are reused across requests."""
+
+    def __init__(self, **client_kwargs: Any) -> None:
+        """Initialize pool with keyword arguments passed to httpx.AsyncClient."""
+        self._client_kwargs = client_kwargs
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get the pooled client, creating it on first use or after close."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(**self._client_kwargs)
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled client and release its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Singleton instance for dependency injection
+_http_pool: HTTPClientPool | None = None
+
+
+def get_http_pool() -> HTTPClientPool:
+    """Get or create HTTP client pool singleton."""
+    global _http_pool
+    if _http_pool is None:
+        _http_pool = HTTPClientPool()
+    return _http_pool
@@ -10,8 +10,9 @@ from fastapi.responses import Response
 
 from agent_marketplace_api.api.v1 import router as api_v1_router
 from agent_marketplace_api.config import get_settings
-from agent_marketplace_api.core.metrics import MetricsMiddleware, get_metrics
+from agent_marketplace_api.core.metrics import MetricsMiddleware, get_metrics_cached
 from agent_marketplace_api.database import async_engine, check_database_connection
+from agent_marketplace_api.http_client import get_http_pool
 
 settings = get_settings()
 
@@ -22,6 +23,7 @@ async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     # Startup
     yield
     # Shutdown
+    await get_http_pool().aclose()
     await async_engine.dispose()
 
 
@@ -80,5 +82,5 @@ async def root() -> dict[str, str]:
 @app.get("/metrics")
 async def metrics() -> Response:
     """Prometheus metrics endpoint."""
-    content, content_type = get_metrics()
+    content, content_type = get_metrics_cached()
     return Response(content=content, media_type=content_type)
@@ -9,11 +9,13 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -29,6 +31,22 @@ class Agent(Base):
     """Agent model representing published AI agents."""
 
     __tablename__ = "agents"
+    __table_args__ = (
+        # Trigram indexes let Postgres serve the search service's ILIKE '%q%' filters
+        *(
+            Index(
+                f"ix_agents_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            ).ddl_if(dialect="postgresql")
+            for column in ("name", "description", "slug")
+        ),
+        # Btree for suggestion prefix lookups: lower(name) LIKE 'q%'
+        Index("ix_agents_name_prefix", text("lower(name) text_pattern_ops")).ddl_if(
+            dialect="postgresql"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -63,8 +81,10 @@ class Agent(Base):
         "User", secondary="agent_stars", back_populates="starred_agents"
     )
 
+    _REPR = "<Agent(id=%s, slug=%r)>"
+
     def __repr__(self) -> str:
-        return f"<Agent(id={self.id}, slug={self.slug!r})>"
+        return self._REPR % (self.id, self.slug)
 
 
 class AgentVersion(Base):
@@ -89,5 +109,7 @@ class AgentVersion(Base):
     # Relationships
     agent: Mapped["Agent"] = relationship("Agent", back_populates="versions")
 
+    _REPR = "<AgentVersion(id=%s, version=%r)>"
+
     def __repr__(self) -> str:
-        return f"<AgentVersion(id={self.id}, version={self.version!r})>"
+        return self._REPR % (self.id, self.version)
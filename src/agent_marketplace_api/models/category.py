@@ -46,5 +46,7 @@ class Category(Base):
         "Agent", secondary=agent_categories, back_populates="categories"
     )
 
+    _REPR = "<Category(id=%s, slug=%r)>"
+
     def __repr__(self) -> str:
-        return f"<Category(id={self.id}, slug={self.slug!r})>"
+        return self._REPR % (self.id, self.slug)
@@ -48,5 +48,7 @@ class Review(Base):
     agent: Mapped["Agent"] = relationship("Agent", back_populates="reviews")
     user: Mapped["User"] = relationship("User", back_populates="reviews")
 
+    _REPR = "<Review(id=%s, agent_id=%s, rating=%s)>"
+
     def __repr__(self) -> str:
-        return f"<Review(id={self.id}, agent_id={self.agent_id}, rating={self.rating})>"
+        return self._REPR % (self.id, self.agent_id, self.rating)
@@ -3,7 +3,17 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Table, Text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from agent_marketplace_api.database import Base
@@ -26,6 +36,16 @@ class User(Base):
     """User model representing marketplace users."""
 
     __tablename__ = "users"
+    __table_args__ = tuple(
+        # Trigram indexes let Postgres serve search_users' ILIKE '%q%' filters
+        Index(
+            f"ix_users_{column}_trgm",
+            column,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql")
+        for column in ("username", "bio")
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     github_id: Mapped[int] = mapped_column(Integer, unique=True, nullable=False, index=True)
@@ -50,5 +70,7 @@ class User(Base):
         "Agent", secondary=agent_stars, back_populates="starred_by"
     )
 
+    _REPR = "<User(id=%s, username=%r)>"
+
     def __repr__(self) -> str:
-        return f"<User(id={self.id}, username={self.username!r})>"
+        return self._REPR % (self.id, self.username)
@@ -1,12 +1,24 @@
 """Agent repository for agent-specific data access."""
 
-from sqlalchemy import func, select
+import re
+from typing import Any
+
+from sqlalchemy import case, exists, func, lambda_stmt, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from agent_marketplace_api.models import Agent
+from agent_marketplace_api.models import Agent, Category, agent_categories
 from agent_marketplace_api.repositories.base import BaseRepository
 
+# Queries below are built with lambda_stmt, so each shape is constructed and
+# cache-keyed once; later calls only extract the closure values as parameters.
+_PUBLIC_SORT_ORDER = {
+    "downloads": Agent.downloads.desc(),
+    "stars": Agent.stars.desc(),
+    "rating": Agent.rating.desc(),
+}
+_DEFAULT_SORT_ORDER = Agent.created_at.desc()
+
 
 class AgentRepository(BaseRepository[Agent]):
     """Repository for Agent model with specialized queries."""
@@ -17,25 +29,31 @@ class AgentRepository(BaseRepository[Agent]):
 
     async def find_by_slug(self, slug: str) -> Agent | None:
         """Find agent by slug."""
-        result = await self.db.execute(
-            select(Agent)
-            .where(Agent.slug == slug)
-            .options(selectinload(Agent.author), selectinload(Agent.versions))
+        stmt = lambda_stmt(
+            lambda: (
+                select(Agent)
+                .where(Agent.slug == slug)
+                .options(selectinload(Agent.author), selectinload(Agent.versions))
+            )
         )
+        result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
     async def find_by_author(
         self, author_id: int, *, limit: int = 20, offset: int = 0
     ) -> list[Agent]:
         """Find all agents by author ID."""
-        result = await self.db.execute(
-            select(Agent)
-            .where(Agent.author_id == author_id)
-            .options(selectinload(Agent.author))
-            .order_by(Agent.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+        stmt = lambda_stmt(
+            lambda: (
+                select(Agent)
+                .where(Agent.author_id == author_id)
+                .options(selectinload(Agent.author))
+                .order_by(Agent.created_at.desc())
+                .limit(limit)
+                .offset(offset)
+            )
         )
+        result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
     async def list_public(
@@ -47,13 +65,11 @@ class AgentRepository(BaseRepository[Agent]):
         sort_by: str = "created_at",
     ) -> list[Agent]:
         """List public agents with optional filtering and sorting."""
-        query = select(Agent).where(Agent.is_public.is_(True))
+        stmt = lambda_stmt(lambda: select(Agent).where(Agent.is_public.is_(True)))
 
         if category:
-            from agent_marketplace_api.models import Category, agent_categories
-
-            # Use exists subquery to avoid duplicates from multi-category agents
-            query = query.where(
+            # Use IN subquery to avoid duplicates from multi-category agents
+            stmt += lambda s: s.where(
                 Agent.id.in_(
                     select(agent_categories.c.agent_id)
                     .join(Category, Category.id == agent_categories.c.category_id)
@@ -62,25 +78,22 @@ class AgentRepository(BaseRepository[Agent]):
             )
 
         # Sorting
-        sort_column = getattr(Agent, sort_by, Agent.created_at)
-        if sort_by in ("downloads", "stars", "rating"):
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(Agent.created_at.desc())
-
-        query = query.options(selectinload(Agent.author)).limit(limit).offset(offset)
+        order_by = _PUBLIC_SORT_ORDER.get(sort_by, _DEFAULT_SORT_ORDER)
+        stmt += lambda s: (
+            s.order_by(order_by).options(selectinload(Agent.author)).limit(limit).offset(offset)
+        )
 
-        result = await self.db.execute(query)
+        result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
     async def count_public(self, *, category: str | None = None) -> int:
         """Count public agents with optional category filter."""
-        query = select(func.count()).select_from(Agent).where(Agent.is_public.is_(True))
+        stmt = lambda_stmt(
+            lambda: select(func.count()).select_from(Agent).where(Agent.is_public.is_(True))
+        )
 
         if category:
-            from agent_marketplace_api.models import Category, agent_categories
-
-            query = query.where(
+            stmt += lambda s: s.where(
                 Agent.id.in_(
                     select(agent_categories.c.agent_id)
                     .join(Category, Category.id == agent_categories.c.category_id)
@@ -88,33 +101,59 @@ class AgentRepository(BaseRepository[Agent]):
                 )
             )
 
-        result = await self.db.execute(query)
-        return result.scalar_one()
+        result = await self.db.execute(stmt)
+        return int(result.scalar_one())
 
     async def slug_exists(self, slug: str) -> bool:
         """Check if a slug already exists."""
+        stmt = lambda_stmt(lambda: select(exists().where(Agent.slug == slug)))
+        result = await self.db.execute(stmt)
+        return bool(result.scalar_one())
+
+    async def find_slug_suffixes(self, base_slug: str) -> set[int]:
+        """Find the numbers already used by ``base_slug-<n>`` slugs.
+
+        Only numbered variants are matched, so unrelated slugs sharing the
+        prefix (``base_slug-pro``) are never fetched. Lets the caller pick a
+        free numbered slug with one query instead of probing each candidate.
+        """
+        prefix = f"{base_slug}-"
+        stmt = select(Agent.slug).where(
+            Agent.slug.startswith(prefix, autoescape=True),
+            Agent.slug.regexp_match(f"^{re.escape(prefix)}[0-9]+$"),
+        )
+        result = await self.db.execute(stmt)
+        return {int(slug[len(prefix) :]) for slug in result.scalars()}
+
+    async def increment_downloads(self, agent_id: int) -> Agent | None:
+        """Increment download counter for an agent.
+
+        Returns:
+            Updated agent, or None if it does not exist
+        """
+        return await self._update_counter(agent_id, downloads=Agent.downloads + 1)
+
+    async def increment_stars(self, agent_id: int) -> Agent | None:
+        """Increment star counter for an agent.
+
+        Returns:
+            Updated agent, or None if it does not exist
+        """
+        return await self._update_counter(agent_id, stars=Agent.stars + 1)
+
+    async def decrement_stars(self, agent_id: int) -> Agent | None:
+        """Decrement star counter for an agent, never going below zero.
+
+        Returns:
+            Updated agent, or None if it does not exist
+        """
+        return await self._update_counter(
+            agent_id, stars=case((Agent.stars > 0, Agent.stars - 1), else_=0)
+        )
+
+    async def _update_counter(self, agent_id: int, **values: Any) -> Agent | None:
+        """Apply a counter update in one UPDATE ... RETURNING round trip."""
         result = await self.db.execute(
-            select(func.count()).select_from(Agent).where(Agent.slug == slug)
+            update(Agent).where(Agent.id == agent_id).values(**values).returning(Agent)
         )
-        return result.scalar_one() > 0
-
-    async def increment_downloads(self, agent_id: int) -> None:
-        """Increment download counter for an agent."""
-        agent = await self.get(agent_id)
-        if agent:
-            agent.downloads += 1
-            await self.db.flush()
-
-    async def increment_stars(self, agent_id: int) -> None:
-        """Increment star counter for an agent."""
-        agent = await self.get(agent_id)
-        if agent:
-            agent.stars += 1
-            await self.db.flush()
-
-    async def decrement_stars(self, agent_id: int) -> None:
-        """Decrement star counter for an agent."""
-        agent = await self.get(agent_id)
-        if agent and agent.stars > 0:
-            agent.stars -= 1
-            await self.db.flush()
+        return result.scalar_one_or_none()
@@ -1,6 +1,9 @@
 """Review repository for data access."""
 
-from sqlalchemy import delete, func, select
+from typing import cast
+
+from sqlalchemy import Integer, bindparam, delete, exists, func, select, update
+from sqlalchemy.engine import CursorResult
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -9,6 +12,21 @@ from agent_marketplace_api.models.review import Review
 from agent_marketplace_api.models.user import agent_stars
 from agent_marketplace_api.repositories.base import BaseRepository
 
+# Star toggle statements are built once and bound per call. The insert only
+# selects a row when the star is absent, so rowcount reports whether it was new.
+_STAR_USER = bindparam("user_id", type_=Integer)
+_STAR_AGENT = bindparam("agent_id", type_=Integer)
+_STAR_INSERT = agent_stars.insert().from_select(
+    ["user_id", "agent_id"],
+    select(_STAR_USER, _STAR_AGENT).where(
+        ~exists().where(agent_stars.c.user_id == _STAR_USER, agent_stars.c.agent_id == _STAR_AGENT)
+    ),
+)
+_STAR_DELETE = delete(agent_stars).where(
+    agent_stars.c.user_id == bindparam("user_id"),
+    agent_stars.c.agent_id == bindparam("agent_id"),
+)
+
 
 class ReviewRepository(BaseRepository[Review]):
     """Repository for review operations."""
@@ -74,12 +92,19 @@ class ReviewRepository(BaseRepository[Review]):
         avg = result.scalar_one()
         return float(avg) if avg else 0.0
 
-    async def increment_helpful(self, review_id: int) -> None:
-        """Increment helpful count for a review."""
-        review = await self.get(review_id)
-        if review:
-            review.helpful_count += 1
-            await self.db.flush()
+    async def increment_helpful(self, review_id: int) -> int | None:
+        """Increment helpful count for a review.
+
+        Returns:
+            New helpful count, or None if the review does not exist
+        """
+        result = await self.db.execute(
+            update(Review)
+            .where(Review.id == review_id)
+            .values(helpful_count=Review.helpful_count + 1)
+            .returning(Review.helpful_count)
+        )
+        return result.scalar_one_or_none()
 
     async def get_with_user(self, review_id: int) -> Review | None:
         """Get review with user relationship loaded."""
@@ -112,12 +137,12 @@ class StarRepository:
         Returns:
             True if star was added, False if already starred
         """
-        if await self.is_starred(user_id, agent_id):
-            return False
-
-        await self.db.execute(agent_stars.insert().values(user_id=user_id, agent_id=agent_id))
+        result = cast(
+            CursorResult[tuple[()]],
+            await self.db.execute(_STAR_INSERT, {"user_id": user_id, "agent_id": agent_id}),
+        )
         await self.db.flush()
-        return True
+        return result.rowcount > 0
 
     async def remove_star(self, user_id: int, agent_id: int) -> bool:
         """Remove a star from an agent.
@@ -125,18 +150,9 @@ class StarRepository:
         Returns:
             True if star was removed, False if not starred
         """
-        from typing import cast
-
-        from sqlalchemy.engine import CursorResult
-
         result = cast(
             CursorResult[tuple[()]],
-            await self.db.execute(
-                delete(agent_stars).where(
-                    agent_stars.c.user_id == user_id,
-                    agent_stars.c.agent_id == agent_id,
-                )
-            ),
+            await self.db.execute(_STAR_DELETE, {"user_id": user_id, "agent_id": agent_id}),
         )
         await self.db.flush()
         return result.rowcount > 0
@@ -151,11 +167,12 @@ class StarRepository:
     async def get_starred_agents(
         self, user_id: int, *, limit: int = 20, offset: int = 0
     ) -> list[Agent]:
-        """Get agents starred by a user."""
+        """Get agents starred by a user, with authors preloaded."""
         result = await self.db.execute(
             select(Agent)
             .join(agent_stars, Agent.id == agent_stars.c.agent_id)
             .where(agent_stars.c.user_id == user_id)
+            .options(selectinload(Agent.author))
             .order_by(agent_stars.c.created_at.desc())
             .limit(limit)
             .offset(offset)
@@ -23,6 +23,7 @@ class AgentSearchParams(BaseModel):
     sort: str = Field("relevance", pattern=r"^(relevance|downloads|stars|rating|created_at)$")
     limit: int = Field(20, ge=1, le=100)
     offset: int = Field(0, ge=0)
+    include_total: bool = True
 
 
 class SuggestionParams(BaseModel):
@@ -43,7 +44,7 @@ class AgentSearchResponse(BaseModel):
     """Response for agent search."""
 
     items: list[AgentSummary]
-    total: int
+    total: int | None
     limit: int
     offset: int
     has_more: bool = False
@@ -6,6 +6,10 @@ from dataclasses import dataclass
 from agent_marketplace_api.models import Agent, AgentVersion, User
 from agent_marketplace_api.repositories import AgentRepository
 from agent_marketplace_api.schemas import AgentCreate, AgentUpdate
+from agent_marketplace_api.services.search_service import invalidate_on_commit
+
+_SLUG_STRIP = re.compile(r"[^\w\s-]")
+_SLUG_SEPARATORS = re.compile(r"[-\s]+")
 
 
 class AgentNotFoundError(Exception):
@@ -90,14 +94,16 @@ class AgentService:
         storage_key: str,
     ) -> Agent:
         """Create a new agent."""
-        slug = self._generate_slug(data.name)
-
-        # Check if slug exists, append number if needed
-        base_slug = slug
-        counter = 1
-        while await self.repo.slug_exists(slug):
+        base_slug = self._generate_slug(data.name)
+
+        # Append the first free number if the slug is taken
+        slug = base_slug
+        if await self.repo.slug_exists(base_slug):
+            used = await self.repo.find_slug_suffixes(base_slug)
+            counter = 1
+            while counter in used:
+                counter += 1
             slug = f"{base_slug}-{counter}"
-            counter += 1
 
         agent = Agent(
             name=data.name,
@@ -117,6 +123,7 @@ class AgentService:
         )
         self.repo.db.add(version)
         await self.repo.db.flush()
+        invalidate_on_commit(self.repo.db)
 
         return agent
 
@@ -139,7 +146,9 @@ class AgentService:
         if data.is_public is not None:
             agent.is_public = data.is_public
 
-        return await self.repo.update(agent)
+        agent = await self.repo.update(agent)
+        invalidate_on_commit(self.repo.db)
+        return agent
 
     async def delete_agent(self, slug: str, user: User) -> None:
         """Delete an agent."""
@@ -149,6 +158,7 @@ class AgentService:
             raise AgentPermissionError("You don't have permission to delete this agent")
 
         await self.repo.delete(agent)
+        invalidate_on_commit(self.repo.db)
 
     async def get_user_agents(
         self,
@@ -162,7 +172,5 @@ class AgentService:
 
     def _generate_slug(self, name: str) -> str:
         """Generate URL-friendly slug from name."""
-        slug = name.lower()
-        slug = re.sub(r"[^\w\s-]", "", slug)
-        slug = re.sub(r"[-\s]+", "-", slug)
-        return slug.strip("-")
+        slug = _SLUG_STRIP.sub("", name.lower())
+        return _SLUG_SEPARATORS.sub("-", slug).strip("-")
@@ -1,21 +1,70 @@
 """Search service for finding agents and users."""
 
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from decimal import Decimal
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import Select, event, func, lambda_stmt, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Session, selectinload
 
 from agent_marketplace_api.models import Agent, User
 
+# Relevance ranks by popularity: downloads, then stars
+_RELEVANCE_ORDER = (Agent.downloads.desc(), Agent.stars.desc())
+_SEARCH_SORT_ORDER = {
+    "downloads": (Agent.downloads.desc(),),
+    "stars": (Agent.stars.desc(),),
+    "rating": (Agent.rating.desc(),),
+    "created_at": (Agent.created_at.desc(),),
+}
+
+# Suggestions are plain strings, so unlike agent/user results they can be shared
+# across requests. Entries expire after a short TTL and are dropped whenever an
+# agent changes; the generation in the key discards results computed mid-change.
+_SUGGESTION_CACHE_SIZE = 128
+_SUGGESTION_TTL_SECONDS = 30.0
+# (generation, lowercased query, limit) -> (expiry, suggestions)
+_SuggestionKey = tuple[int, str, int]
+_suggestion_cache: OrderedDict[_SuggestionKey, tuple[float, tuple[str, ...]]] = OrderedDict()
+_search_generation = 0
+
+# Session.info flag set by writes that change agents; see invalidate_on_commit
+_INVALIDATE_ON_COMMIT = "invalidate_search_cache"
+
+
+def invalidate_search_cache() -> None:
+    """Discard cached search suggestions after agents are created, changed or deleted."""
+    global _search_generation
+    _search_generation += 1
+    _suggestion_cache.clear()
+
+
+def invalidate_on_commit(db: AsyncSession) -> None:
+    """
+    Discard cached search suggestions once the session's transaction commits.
+
+    Invalidating before the commit would let a concurrent request re-cache the
+    old rows in between, so writes that go through a request-scoped session
+    defer it to the commit instead.
+    """
+    db.info[_INVALIDATE_ON_COMMIT] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    """Invalidate the search cache if the committed transaction changed agents."""
+    if session.info.pop(_INVALIDATE_ON_COMMIT, False):
+        invalidate_search_cache()
+
 
 @dataclass
 class AgentSearchResult:
     """Result of agent search."""
 
     items: list[Agent]
-    total: int
+    total: int | None
     limit: int
     offset: int
     has_more: bool
@@ -46,6 +95,7 @@ class SearchService:
         sort: str = "relevance",
         limit: int = 20,
         offset: int = 0,
+        include_total: bool = True,
     ) -> AgentSearchResult:
         """
         Search agents by name and description.
@@ -57,23 +107,13 @@ class SearchService:
             sort: Sort order (relevance, downloads, stars, rating, created_at)
             limit: Maximum results to return
             offset: Offset for pagination
+            include_total: Count all matches; when False, total is None and
+                has_more comes from fetching one extra row instead
 
         Returns:
             AgentSearchResult with matching agents
         """
-        # Build base query
-        stmt = select(Agent).where(Agent.is_public.is_(True))
-
-        # Apply text search filter only if query is provided
-        if query:
-            search_pattern = f"%{query}%"
-            stmt = stmt.where(
-                or_(
-                    Agent.name.ilike(search_pattern),
-                    Agent.description.ilike(search_pattern),
-                    Agent.slug.ilike(search_pattern),
-                )
-            )
+        stmt = self._public_agents_matching(query)
 
         # Apply category filter
         if category:
@@ -84,36 +124,53 @@ class SearchService:
             stmt = stmt.where(Agent.rating >= Decimal(str(min_rating)))
 
         # Count total before pagination
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        count_result = await self.db.execute(count_stmt)
-        total = count_result.scalar_one()
-
-        # Apply sorting
-        if sort == "downloads":
-            stmt = stmt.order_by(Agent.downloads.desc())
-        elif sort == "stars":
-            stmt = stmt.order_by(Agent.stars.desc())
-        elif sort == "rating":
-            stmt = stmt.order_by(Agent.rating.desc())
-        elif sort == "created_at":
-            stmt = stmt.order_by(Agent.created_at.desc())
-        else:  # relevance - prioritize name matches, then by downloads
-            stmt = stmt.order_by(Agent.downloads.desc(), Agent.stars.desc())
-
-        # Apply pagination and load relationships
-        stmt = stmt.options(selectinload(Agent.author)).limit(limit).offset(offset)
+        total: int | None = None
+        if include_total:
+            count_stmt = select(func.count()).select_from(stmt.subquery())
+            count_result = await self.db.execute(count_stmt)
+            total = count_result.scalar_one()
+
+        stmt = stmt.order_by(*_SEARCH_SORT_ORDER.get(sort, _RELEVANCE_ORDER))
+
+        # Apply pagination and load relationships; without a total, one extra
+        # row tells whether another page exists
+        page_size = limit if include_total else limit + 1
+        stmt = stmt.options(selectinload(Agent.author)).limit(page_size).offset(offset)
 
         result = await self.db.execute(stmt)
         items = list(result.scalars().all())
 
+        if total is None:
+            has_more = len(items) > limit
+            items = items[:limit]
+        else:
+            has_more = offset + len(items) < total
+
         return AgentSearchResult(
             items=items,
             total=total,
             limit=limit,
             offset=offset,
-            has_more=offset + len(items) < total,
+            has_more=has_more,
         )
 
+    @staticmethod
+    def _public_agents_matching(query: str) -> Select[Agent]:
+        """Build a query for public agents whose name, description or slug match."""
+        stmt = select(Agent).where(Agent.is_public.is_(True))
+
+        # Apply text search filter only if query is provided
+        if query:
+            search_pattern = f"%{query}%"
+            stmt = stmt.where(
+                or_(
+                    Agent.name.ilike(search_pattern),
+                    Agent.description.ilike(search_pattern),
+                    Agent.slug.ilike(search_pattern),
+                )
+            )
+        return stmt
+
     async def search_users(
         self,
         query: str,
@@ -132,17 +189,19 @@ class SearchService:
         """
         search_pattern = f"%{query}%"
 
-        stmt = (
-            select(User)
-            .where(User.is_active.is_(True))
-            .where(
-                or_(
-                    User.username.ilike(search_pattern),
-                    User.bio.ilike(search_pattern),
+        stmt = lambda_stmt(
+            lambda: (
+                select(User)
+                .where(User.is_active.is_(True))
+                .where(
+                    or_(
+                        User.username.ilike(search_pattern),
+                        User.bio.ilike(search_pattern),
+                    )
                 )
+                .order_by(User.reputation.desc())
+                .limit(limit)
             )
-            .order_by(User.reputation.desc())
-            .limit(limit)
         )
 
         result = await self.db.execute(stmt)
@@ -169,9 +228,16 @@ class SearchService:
         agents: list[Agent] = []
         users: list[User] = []
 
+        # Same ordering as search_agents, minus the COUNT it would run for paging
         if search_type is None or search_type == "agents":
-            agent_result = await self.search_agents(query, limit=limit)
-            agents = agent_result.items
+            stmt = (
+                self._public_agents_matching(query)
+                .order_by(*_RELEVANCE_ORDER)
+                .options(selectinload(Agent.author))
+                .limit(limit)
+            )
+            result = await self.db.execute(stmt)
+            agents = list(result.scalars().all())
 
         if search_type is None or search_type == "users":
             users = await self.search_users(query, limit=limit)
@@ -200,15 +266,34 @@ class SearchService:
         Returns:
             List of suggestion strings
         """
-        search_pattern = f"{query}%"
-
-        # Get agent names that start with the query
-        stmt = (
-            select(Agent.name)
-            .where(Agent.is_public.is_(True))
-            .where(Agent.name.ilike(search_pattern))
-            .order_by(Agent.downloads.desc())
-            .limit(limit)
+        key = (_search_generation, query.lower(), limit)
+        now = time.monotonic()
+        cached = _suggestion_cache.get(key)
+        if cached is not None and cached[0] > now:
+            _suggestion_cache.move_to_end(key)
+            return list(cached[1])
+
+        suggestions = await self._query_suggestions(query, limit)
+
+        _suggestion_cache[key] = (now + _SUGGESTION_TTL_SECONDS, tuple(suggestions))
+        _suggestion_cache.move_to_end(key)
+        if len(_suggestion_cache) > _SUGGESTION_CACHE_SIZE:
+            _suggestion_cache.popitem(last=False)
+        return suggestions
+
+    async def _query_suggestions(self, query: str, limit: int) -> list[str]:
+        """Fetch suggestions from the database, prefix matches first."""
+        search_pattern = f"{query.lower()}%"
+
+        # Get agent names that start with the query (matches ix_agents_name_prefix)
+        stmt = lambda_stmt(
+            lambda: (
+                select(Agent.name)
+                .where(Agent.is_public.is_(True))
+                .where(func.lower(Agent.name).like(search_pattern))
+                .order_by(Agent.downloads.desc())
+                .limit(limit)
+            )
         )
 
         result = await self.db.execute(stmt)
@@ -219,13 +304,15 @@ class SearchService:
             partial_pattern = f"%{query}%"
             remaining = limit - len(suggestions)
 
-            stmt = (
-                select(Agent.name)
-                .where(Agent.is_public.is_(True))
-                .where(Agent.name.ilike(partial_pattern))
-                .where(~Agent.name.in_(suggestions))
-                .order_by(Agent.downloads.desc())
-                .limit(remaining)
+            stmt = lambda_stmt(
+                lambda: (
+                    select(Agent.name)
+                    .where(Agent.is_public.is_(True))
+                    .where(Agent.name.ilike(partial_pattern))
+                    .where(~Agent.name.in_(suggestions))
+                    .order_by(Agent.downloads.desc())
+                    .limit(remaining)
+                )
             )
 
             result = await self.db.execute(stmt)
@@ -1,16 +1,32 @@
 """Storage service for S3/MinIO file operations."""
 
 import asyncio
+import contextlib
 from dataclasses import dataclass
-from typing import BinaryIO
+from typing import Any, BinaryIO
 
 import boto3
-from botocore.exceptions import ClientError
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 
 from agent_marketplace_api.config import get_settings
 
 settings = get_settings()
 
+# S3 DeleteObjects accepts at most 1000 keys per request
+_DELETE_BATCH_SIZE = 1000
+# Objects larger than this are downloaded as concurrent byte-range GETs
+_DOWNLOAD_PART_SIZE = 8 * 1024 * 1024
+# At most this many byte ranges of one download are in flight at once
+_DOWNLOAD_CONCURRENCY = 8
+# Byte payloads larger than this are uploaded as concurrent multipart parts
+_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+_UPLOAD_PART_SIZE = 8 * 1024 * 1024
+# At most this many parts of one multipart upload are in flight at once
+_UPLOAD_CONCURRENCY = 8
+# Files larger than this should be uploaded straight to S3 with a presigned URL
+_DIRECT_UPLOAD_THRESHOLD = 8 * 1024 * 1024
+
 
 class StorageError(Exception):
     """Base exception for storage operations."""
@@ -50,20 +66,34 @@ class StorageService:
         secret_key: str | None = None,
         bucket: str | None = None,
         region: str | None = None,
+        client: Any | None = None,
     ) -> None:
-        """Initialize storage service with S3 configuration."""
+        """Initialize storage service with S3 configuration.
+
+        A prebuilt S3 ``client`` may be passed in; otherwise one is created
+        from the connection settings.
+        """
         self.endpoint_url = endpoint_url or settings.s3_endpoint
         self.access_key = access_key or settings.s3_access_key
         self.secret_key = secret_key or settings.s3_secret_key
         self.bucket = bucket or settings.s3_bucket
         self.region = region or settings.s3_region
 
+        if client is not None:
+            self._client = client
+            return
+
         self._client = boto3.client(
             "s3",
             endpoint_url=self.endpoint_url,
             aws_access_key_id=self.access_key,
             aws_secret_access_key=self.secret_key,
             region_name=self.region,
+            # Size the pool for concurrent to_thread calls sharing this client
+            config=Config(
+                max_pool_connections=settings.s3_max_pool_connections,
+                retries={"mode": "standard"},
+            ),
         )
 
     async def upload_file(
@@ -85,6 +115,8 @@ class StorageService:
         Raises:
             UploadError: If upload fails
         """
+        if isinstance(file_data, bytes) and len(file_data) > _MULTIPART_THRESHOLD:
+            return await self._upload_multipart(key, file_data, content_type)
 
         def _upload() -> UploadResult:
             try:
@@ -121,9 +153,82 @@ class StorageService:
 
         return await asyncio.to_thread(_upload)
 
+    async def _upload_multipart(
+        self, key: str, file_data: bytes, content_type: str
+    ) -> UploadResult:
+        """Upload bytes as a multipart upload, sending the parts concurrently."""
+        try:
+            upload = await asyncio.to_thread(
+                self._client.create_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                ContentType=content_type,
+            )
+        except (ClientError, BotoCoreError) as e:
+            raise UploadError(f"Failed to upload file: {e}") from e
+        upload_id = upload["UploadId"]
+
+        def _upload_part(number: int, start: int) -> dict[str, Any]:
+            response = self._client.upload_part(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=number,
+                Body=file_data[start : start + _UPLOAD_PART_SIZE],
+            )
+            return {"ETag": response["ETag"], "PartNumber": number}
+
+        semaphore = asyncio.Semaphore(_UPLOAD_CONCURRENCY)
+
+        async def _send_part(number: int, start: int) -> dict[str, Any]:
+            async with semaphore:
+                return await asyncio.to_thread(_upload_part, number, start)
+
+        tasks = [
+            asyncio.ensure_future(_send_part(number, start))
+            for number, start in enumerate(range(0, len(file_data), _UPLOAD_PART_SIZE), start=1)
+        ]
+        completed = False
+        try:
+            parts = await asyncio.gather(*tasks)
+            response = await asyncio.to_thread(
+                self._client.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+            completed = True
+        except (ClientError, BotoCoreError) as e:
+            raise UploadError(f"Failed to upload file: {e}") from e
+        finally:
+            if not completed:
+                # Stop queued parts, then abort so S3 does not keep (and bill
+                # for) the parts already uploaded
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                with contextlib.suppress(ClientError, BotoCoreError):
+                    await asyncio.to_thread(
+                        self._client.abort_multipart_upload,
+                        Bucket=self.bucket,
+                        Key=key,
+                        UploadId=upload_id,
+                    )
+
+        return UploadResult(
+            key=key,
+            bucket=self.bucket,
+            size_bytes=len(file_data),
+            etag=response.get("ETag", "").strip('"'),
+        )
+
     async def download_file(self, key: str) -> bytes:
         """Download a file from S3/MinIO.
 
+        The first part is requested as a byte range; its Content-Range gives
+        the object size, and any remaining parts are fetched concurrently.
+
         Args:
             key: The S3 object key (path)
 
@@ -134,19 +239,62 @@ class StorageService:
             FileNotFoundError: If file doesn't exist
             StorageError: If download fails
         """
+        try:
+            data, response = await asyncio.to_thread(
+                self._get_object, key, Range=f"bytes=0-{_DOWNLOAD_PART_SIZE - 1}"
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code", "") == "InvalidRange":
+                return b""  # no byte range exists in an empty object
+            raise self._download_error(key, e) from e
+
+        content_range = response.get("ContentRange")
+        size = int(content_range.rsplit("/", 1)[1]) if content_range else len(data)
+        if size <= len(data):
+            return data
+
+        # IfMatch makes S3 reject the remaining parts if the object changed meanwhile
+        etag = response.get("ETag", "")
+        semaphore = asyncio.Semaphore(_DOWNLOAD_CONCURRENCY)
+
+        async def _get_range(start: int) -> tuple[bytes, dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._get_object,
+                    key,
+                    Range=f"bytes={start}-{min(start + _DOWNLOAD_PART_SIZE, size) - 1}",
+                    IfMatch=etag,
+                )
 
-        def _download() -> bytes:
-            try:
-                response = self._client.get_object(Bucket=self.bucket, Key=key)
-                data: bytes = response["Body"].read()
-                return data
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "")
-                if error_code in ("404", "NoSuchKey"):
-                    raise FileNotFoundError(f"File not found: {key}") from e
-                raise StorageError(f"Failed to download file: {e}") from e
-
-        return await asyncio.to_thread(_download)
+        tasks = [
+            asyncio.ensure_future(_get_range(start))
+            for start in range(len(data), size, _DOWNLOAD_PART_SIZE)
+        ]
+        try:
+            parts = await asyncio.gather(*tasks)
+        except ClientError as e:
+            raise self._download_error(key, e) from e
+        finally:
+            # Stop queued ranges once one fails or the caller is cancelled
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return b"".join([data, *(part for part, _ in parts)])
+
+    def _get_object(self, key: str, **kwargs: str) -> tuple[bytes, dict[str, Any]]:
+        """Fetch an object or byte range, returning its bytes and response."""
+        response: dict[str, Any] = self._client.get_object(Bucket=self.bucket, Key=key, **kwargs)
+        data: bytes = response["Body"].read()
+        return data, response
+
+    @staticmethod
+    def _download_error(key: str, error: ClientError) -> StorageError:
+        """Map a GetObject failure to the storage exception to raise."""
+        error_code = error.response.get("Error", {}).get("Code", "")
+        if error_code in ("404", "NoSuchKey"):
+            return FileNotFoundError(f"File not found: {key}")
+        return StorageError(f"Failed to download file: {error}")
 
     async def delete_file(self, key: str) -> None:
         """Delete a file from S3/MinIO.
@@ -166,6 +314,34 @@ class StorageService:
 
         await asyncio.to_thread(_delete)
 
+    async def delete_files(self, keys: list[str]) -> None:
+        """Delete many files from S3/MinIO, up to 1000 keys per request.
+
+        Args:
+            keys: The S3 object keys (paths)
+
+        Raises:
+            StorageError: If any key could not be deleted
+        """
+
+        def _delete_many() -> None:
+            for start in range(0, len(keys), _DELETE_BATCH_SIZE):
+                batch = keys[start : start + _DELETE_BATCH_SIZE]
+                try:
+                    response = self._client.delete_objects(
+                        Bucket=self.bucket,
+                        Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                    )
+                except ClientError as e:
+                    raise StorageError(f"Failed to delete files: {e}") from e
+
+                errors = response.get("Errors", [])
+                if errors:
+                    failed = ", ".join(error["Key"] for error in errors)
+                    raise StorageError(f"Failed to delete files: {failed}")
+
+        await asyncio.to_thread(_delete_many)
+
     async def file_exists(self, key: str) -> bool:
         """Check if a file exists in S3/MinIO.
 
@@ -279,6 +455,30 @@ class StorageService:
         """
         return self.generate_presigned_url(key, expires_in, "put_object")
 
+    async def upload_via_presigned(
+        self,
+        key: str,
+        size_hint: int,
+        expires_in: int = 3600,
+    ) -> str | None:
+        """Get a presigned upload URL if a file is large enough to bypass the API.
+
+        Callers should PUT large files straight to the returned URL so the
+        bytes never pass through the API host, and send smaller files through
+        upload_file as usual.
+
+        Args:
+            key: The S3 object key (path)
+            size_hint: Expected file size in bytes
+            expires_in: URL expiration time in seconds (default: 1 hour)
+
+        Returns:
+            Presigned upload URL, or None if the file should go through upload_file
+        """
+        if size_hint <= _DIRECT_UPLOAD_THRESHOLD:
+            return None
+        return await self.generate_presigned_upload_url(key, expires_in)
+
     async def ensure_bucket_exists(self) -> None:
         """Ensure the configured bucket exists, creating it if necessary."""
 
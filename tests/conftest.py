@@ -1,24 +1,89 @@
 """Shared test fixtures."""
 
-from collections.abc import AsyncGenerator
+from collections import deque
+from collections.abc import AsyncGenerator, Iterator
+from functools import partial
 from typing import Any
 from unittest.mock import AsyncMock, patch
 
+import bcrypt
+import httpx
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
 
 from agent_marketplace_api.database import Base, get_db
+from agent_marketplace_api.http_client import HTTPClientPool
 from agent_marketplace_api.main import app
+from agent_marketplace_api.models import User
+from agent_marketplace_api.services.search_service import invalidate_search_cache
 
+_SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
 
-@pytest.fixture
+
+class FakeUserService:
+    """Minimal stand-in for UserService that records the requested user ID."""
+
+    def __init__(self, user: User | None = None, exc: Exception | None = None) -> None:
+        self.user = user
+        self.exc = exc
+        self.called_with: int | None = None
+
+    async def get_user_by_id(self, user_id: int) -> User | None:
+        self.called_with = user_id
+        if self.exc:
+            raise self.exc
+        return self.user
+
+
+# Applied once per DBAPI connection; StaticPool keeps that one connection for
+# the whole session. journal_mode=WAL is left out as it is a no-op in memory.
+_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+
+def _enable_sqlite_savepoints(engine: Any) -> None:
+    """Let SQLAlchemy own BEGIN so SAVEPOINTs work on the sqlite3 driver."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, _connection_record: Any) -> None:
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _on_begin(conn: Any) -> None:
+        conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _fast_bcrypt() -> Iterator[None]:
+    """Hash test passwords at the minimum bcrypt cost; the code path is unchanged."""
+    with patch("bcrypt.gensalt", partial(bcrypt.gensalt, rounds=4)):
+        yield
+
+
+@pytest.fixture(scope="session")
 async def db_engine() -> AsyncGenerator[Any, None]:
-    """Test database engine using in-memory SQLite."""
+    """Test database engine using in-memory SQLite, schema built once per session."""
     engine = create_async_engine(
         "sqlite+aiosqlite:///:memory:",
         echo=False,
+        poolclass=StaticPool,
     )
+    _enable_sqlite_savepoints(engine)
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -28,18 +93,90 @@ async def db_engine() -> AsyncGenerator[Any, None]:
     await engine.dispose()
 
 
+@pytest.fixture(scope="session")
+async def db_connection(db_engine: Any) -> AsyncGenerator[AsyncConnection, None]:
+    """Session-wide connection holding an outer transaction that is never committed."""
+    async with db_engine.connect() as conn:
+        trans = await conn.begin()
+        yield conn
+        await trans.rollback()
+
+
 @pytest.fixture
-async def db_session(db_engine: Any) -> AsyncGenerator[AsyncSession, None]:
-    """Test database session."""
+async def db_session(db_connection: AsyncConnection) -> AsyncGenerator[AsyncSession, None]:
+    """Test database session, rolled back to a SAVEPOINT after each test.
+
+    The session joins the shared connection in ``create_savepoint`` mode, so
+    ``commit()`` calls made by tests or endpoints only release the session's
+    own SAVEPOINT and never escape the per-test one.
+    """
+    savepoint = await db_connection.begin_nested()
     session_maker = async_sessionmaker(
-        db_engine,
+        bind=db_connection,
         class_=AsyncSession,
         expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
     )
 
     async with session_maker() as session:
         yield session
 
+    if savepoint.is_active:
+        await savepoint.rollback()
+
+
+@pytest.fixture(autouse=True)
+def _clear_search_cache() -> None:
+    """Keep cached suggestions from leaking between tests."""
+    invalidate_search_cache()
+
+
+@pytest.fixture
+def query_counter(db_connection: AsyncConnection) -> Iterator[list[str]]:
+    """SQL statements executed on the test connection while the fixture is active.
+
+    SAVEPOINT bookkeeping from the per-test session is ignored. Request it
+    after the data fixtures so their setup is not counted.
+    """
+    statements: list[str] = []
+
+    def _record(_conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+        if not statement.startswith(_SAVEPOINT_STATEMENTS):
+            statements.append(statement)
+
+    sync_conn = db_connection.sync_connection
+    event.listen(sync_conn, "before_cursor_execute", _record)
+    yield statements
+    event.remove(sync_conn, "before_cursor_execute", _record)
+
+
+@pytest.fixture(scope="session")
+def queued_responses() -> deque[httpx.Response]:
+    """Responses replayed in order by the session HTTP pool's mock transport."""
+    return deque()
+
+
+@pytest.fixture(scope="session")
+async def http_pool(
+    queued_responses: deque[httpx.Response],
+) -> AsyncGenerator[HTTPClientPool, None]:
+    """Session-wide HTTP client pool backed by a MockTransport."""
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return queued_responses.popleft()
+
+    pool = HTTPClientPool(transport=httpx.MockTransport(handler))
+    yield pool
+    await pool.aclose()
+
+
+@pytest.fixture
+def http_responses(queued_responses: deque[httpx.Response]) -> Iterator[deque[httpx.Response]]:
+    """Queue for the responses the pooled client should return in this test."""
+    queued_responses.clear()
+    yield queued_responses
+    queued_responses.clear()
+
 
 @pytest.fixture
 async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
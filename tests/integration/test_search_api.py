@@ -241,6 +241,21 @@ class TestAgentSearch:
         data = response.json()
         assert len(data["items"]) <= 1
 
+    @pytest.mark.asyncio
+    async def test_agent_search_without_total(
+        self,
+        client: AsyncClient,
+        search_agents: list[Agent],  # noqa: ARG002
+    ) -> None:
+        """Test agent search can skip the total count."""
+        response = await client.get("/api/v1/search/agents?q=code&limit=1&include_total=false")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        assert len(data["items"]) == 1
+        assert data["has_more"] is True
+
 
 class TestSearchSuggestions:
     """Tests for GET /api/v1/search/suggestions endpoint."""
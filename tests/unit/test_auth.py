@@ -1,7 +1,10 @@
 """Unit tests for auth module (GitHub OAuth)."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections import deque
+from typing import Any
+from unittest.mock import patch
 
+import httpx
 import pytest
 
 from agent_marketplace_api.auth import (
@@ -10,125 +13,97 @@ from agent_marketplace_api.auth import (
     exchange_github_code,
     get_github_user,
 )
+from agent_marketplace_api.http_client import HTTPClientPool
+
+Responses = deque[httpx.Response]
 
 
 class TestExchangeGitHubCode:
     """Tests for exchange_github_code function."""
 
-    @pytest.mark.asyncio
     async def test_exchange_code_success(self) -> None:
         """Test successful code exchange."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"access_token": "test_token"}
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"access_token": "test_token"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            token = await exchange_github_code("test_code", client)
 
-        with patch("agent_marketplace_api.auth.httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+        assert token == "test_token"
+        assert requests[0].url == "https://github.com/login/oauth/access_token"
+        assert b"code=test_code" in requests[0].content
+
+    async def test_exchange_code_default_client(
+        self, http_pool: HTTPClientPool, http_responses: Responses
+    ) -> None:
+        """Test code exchange falls back to the shared client pool."""
+        http_responses.append(httpx.Response(200, json={"access_token": "test_token"}))
 
+        with patch("agent_marketplace_api.auth.get_http_pool", return_value=http_pool):
             token = await exchange_github_code("test_code")
 
         assert token == "test_token"
 
-    @pytest.mark.asyncio
-    async def test_exchange_code_http_error(self) -> None:
-        """Test code exchange with HTTP error."""
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_response.text = "Internal Server Error"
-
-        with patch("agent_marketplace_api.auth.httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
-
-            with pytest.raises(GitHubOAuthError, match="Failed to exchange code"):
-                await exchange_github_code("test_code")
-
-    @pytest.mark.asyncio
-    async def test_exchange_code_oauth_error(self) -> None:
-        """Test code exchange with OAuth error in response."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "error": "bad_verification_code",
-            "error_description": "The code passed is incorrect",
-        }
-
-        with patch("agent_marketplace_api.auth.httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
-
-            with pytest.raises(GitHubOAuthError, match="The code passed is incorrect"):
-                await exchange_github_code("bad_code")
-
-    @pytest.mark.asyncio
-    async def test_exchange_code_oauth_error_without_description(self) -> None:
-        """Test code exchange with OAuth error without description."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"error": "access_denied"}
-
-        with patch("agent_marketplace_api.auth.httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
-
-            with pytest.raises(GitHubOAuthError, match="access_denied"):
-                await exchange_github_code("denied_code")
-
-    @pytest.mark.asyncio
-    async def test_exchange_code_no_token(self) -> None:
-        """Test code exchange with no access token in response."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {}
-
-        with patch("agent_marketplace_api.auth.httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
-
-            with pytest.raises(GitHubOAuthError, match="No access token"):
-                await exchange_github_code("test_code")
+    @pytest.mark.parametrize(
+        ("status_code", "json_body", "match"),
+        [
+            (500, None, "Failed to exchange code"),
+            (
+                200,
+                {
+                    "error": "bad_verification_code",
+                    "error_description": "The code passed is incorrect",
+                },
+                "The code passed is incorrect",
+            ),
+            (200, {"error": "access_denied"}, "access_denied"),
+            (200, {}, "No access token"),
+        ],
+        ids=["http_error", "oauth_error", "oauth_error_without_description", "no_token"],
+    )
+    async def test_exchange_code_errors(
+        self,
+        http_pool: HTTPClientPool,
+        http_responses: Responses,
+        status_code: int,
+        json_body: dict[str, str] | None,
+        match: str,
+    ) -> None:
+        """Test code exchange failures raise GitHubOAuthError."""
+        if json_body is None:
+            response = httpx.Response(status_code, text="Internal Server Error")
+        else:
+            response = httpx.Response(status_code, json=json_body)
+        http_responses.append(response)
+
+        with pytest.raises(GitHubOAuthError, match=match):
+            await exchange_github_code("test_code", http_pool.client)
 
 
 class TestGetGitHubUser:
     """Tests for get_github_user function."""
 
-    @pytest.mark.asyncio
-    async def test_get_user_success_with_email(self) -> None:
+    async def test_get_user_success_with_email(
+        self, http_pool: HTTPClientPool, http_responses: Responses
+    ) -> None:
         """Test successful user fetch with public email."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "id": 12345,
-            "login": "testuser",
-            "email": "test@example.com",
-            "avatar_url": "https://avatars.github.com/u/12345",
-            "name": "Test User",
-        }
-
-        with patch("agent_marketplace_api.auth.httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.get.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+        response = httpx.Response(
+            200,
+            json={
+                "id": 12345,
+                "login": "testuser",
+                "email": "test@example.com",
+                "avatar_url": "https://avatars.github.com/u/12345",
+                "name": "Test User",
+            },
+        )
 
-            user = await get_github_user("test_token")
+        http_responses.append(response)
+
+        user = await get_github_user("test_token", http_pool.client)
 
         assert isinstance(user, GitHubUser)
         assert user.id == 12345
@@ -137,110 +112,89 @@ class TestGetGitHubUser:
         assert user.avatar_url == "https://avatars.github.com/u/12345"
         assert user.name == "Test User"
 
-    @pytest.mark.asyncio
-    async def test_get_user_success_without_email(self) -> None:
-        """Test successful user fetch without public email (fetches from emails endpoint)."""
-        user_response = MagicMock()
-        user_response.status_code = 200
-        user_response.json.return_value = {
-            "id": 12345,
-            "login": "testuser",
-            "email": None,
-            "avatar_url": "https://avatars.github.com/u/12345",
-            "name": "Test User",
-        }
-
-        email_response = MagicMock()
-        email_response.status_code = 200
-        email_response.json.return_value = [
-            {"email": "secondary@example.com", "primary": False, "verified": True},
-            {"email": "primary@example.com", "primary": True, "verified": True},
-        ]
-
-        with patch("agent_marketplace_api.auth.httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.get.side_effect = [user_response, email_response]
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+    async def test_get_user_default_client(
+        self, http_pool: HTTPClientPool, http_responses: Responses
+    ) -> None:
+        """Test user fetch falls back to the shared client pool."""
+        http_responses.append(
+            httpx.Response(200, json={"id": 1, "login": "octocat", "email": "o@example.com"})
+        )
 
+        with patch("agent_marketplace_api.auth.get_http_pool", return_value=http_pool):
             user = await get_github_user("test_token")
 
-        assert user.email == "primary@example.com"
+        assert user.login == "octocat"
 
-    @pytest.mark.asyncio
-    async def test_get_user_email_endpoint_fails(self) -> None:
-        """Test user fetch when email endpoint fails."""
-        user_response = MagicMock()
-        user_response.status_code = 200
-        user_response.json.return_value = {
-            "id": 12345,
-            "login": "testuser",
-            "email": None,
-            "avatar_url": None,
-            "name": None,
-        }
-
-        email_response = MagicMock()
-        email_response.status_code = 403
-
-        with patch("agent_marketplace_api.auth.httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.get.side_effect = [user_response, email_response]
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+    async def test_get_user_success_without_email(
+        self, http_pool: HTTPClientPool, http_responses: Responses
+    ) -> None:
+        """Test successful user fetch without public email (fetches from emails endpoint)."""
+        user_response = httpx.Response(
+            200,
+            json={
+                "id": 12345,
+                "login": "testuser",
+                "email": None,
+                "avatar_url": "https://avatars.github.com/u/12345",
+                "name": "Test User",
+            },
+        )
+        email_response = httpx.Response(
+            200,
+            json=[
+                {"email": "secondary@example.com", "primary": False, "verified": True},
+                {"email": "primary@example.com", "primary": True, "verified": True},
+            ],
+        )
 
-            user = await get_github_user("test_token")
+        http_responses.extend([user_response, email_response])
 
-        assert user.email is None
+        user = await get_github_user("test_token", http_pool.client)
 
-    @pytest.mark.asyncio
-    async def test_get_user_no_primary_verified_email(self) -> None:
-        """Test user fetch when no primary verified email exists."""
-        user_response = MagicMock()
-        user_response.status_code = 200
-        user_response.json.return_value = {
-            "id": 12345,
-            "login": "testuser",
-            "email": None,
-            "avatar_url": None,
-            "name": None,
-        }
-
-        email_response = MagicMock()
-        email_response.status_code = 200
-        email_response.json.return_value = [
-            {"email": "unverified@example.com", "primary": True, "verified": False},
-        ]
-
-        with patch("agent_marketplace_api.auth.httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.get.side_effect = [user_response, email_response]
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+        assert user.email == "primary@example.com"
 
-            user = await get_github_user("test_token")
+    @pytest.mark.parametrize(
+        ("email_status", "email_body"),
+        [
+            (403, None),
+            (200, [{"email": "unverified@example.com", "primary": True, "verified": False}]),
+        ],
+        ids=["email_endpoint_fails", "no_primary_verified_email"],
+    )
+    async def test_get_user_without_resolvable_email(
+        self,
+        http_pool: HTTPClientPool,
+        http_responses: Responses,
+        email_status: int,
+        email_body: list[dict[str, Any]] | None,
+    ) -> None:
+        """Test user fetch when no email can be resolved from the emails endpoint."""
+        user_response = httpx.Response(
+            200,
+            json={
+                "id": 12345,
+                "login": "testuser",
+                "email": None,
+                "avatar_url": None,
+                "name": None,
+            },
+        )
+        email_response = httpx.Response(email_status, json=email_body)
+
+        http_responses.extend([user_response, email_response])
+
+        user = await get_github_user("test_token", http_pool.client)
 
         assert user.email is None
 
-    @pytest.mark.asyncio
-    async def test_get_user_http_error(self) -> None:
+    async def test_get_user_http_error(
+        self, http_pool: HTTPClientPool, http_responses: Responses
+    ) -> None:
         """Test user fetch with HTTP error."""
-        mock_response = MagicMock()
-        mock_response.status_code = 401
-        mock_response.text = "Unauthorized"
-
-        with patch("agent_marketplace_api.auth.httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.get.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
-
-            with pytest.raises(GitHubOAuthError, match="Failed to get user info"):
-                await get_github_user("invalid_token")
+        http_responses.append(httpx.Response(401, text="Unauthorized"))
+
+        with pytest.raises(GitHubOAuthError, match="Failed to get user info"):
+            await get_github_user("invalid_token", http_pool.client)
 
 
 class TestGitHubUser:
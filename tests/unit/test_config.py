@@ -7,13 +7,16 @@ import pytest
 
 from agent_marketplace_api.config import Settings, get_settings
 
+# Defaults never change between tests, so validate them once
+_BASE = Settings()
+
 
 class TestSettings:
     """Tests for Settings class."""
 
     def test_default_settings(self) -> None:
         """Test default settings values."""
-        settings = Settings()
+        settings = _BASE
 
         assert settings.app_name == "Agent Marketplace API"
         assert settings.app_version == "0.1.0"
@@ -23,7 +26,7 @@ class TestSettings:
 
     def test_database_defaults(self) -> None:
         """Test default database settings."""
-        settings = Settings()
+        settings = _BASE
 
         assert "postgresql+asyncpg" in str(settings.database_url)
         assert settings.database_echo is False
@@ -32,21 +35,22 @@ class TestSettings:
 
     def test_redis_defaults(self) -> None:
         """Test default Redis settings."""
-        settings = Settings()
+        settings = _BASE
 
         assert "redis://localhost:6379" in str(settings.redis_url)
 
     def test_s3_defaults(self) -> None:
         """Test default S3/MinIO settings."""
-        settings = Settings()
+        settings = _BASE
 
         assert settings.s3_endpoint == "http://localhost:9000"
         assert settings.s3_bucket == "agent-marketplace"
         assert settings.s3_region == "us-east-1"
+        assert settings.s3_max_pool_connections == 64
 
     def test_jwt_defaults(self) -> None:
         """Test default JWT settings."""
-        settings = Settings()
+        settings = _BASE
 
         assert settings.jwt_algorithm == "HS256"
         assert settings.jwt_access_token_expire_minutes == 30
@@ -81,7 +85,7 @@ class TestSettings:
 
     def test_celery_defaults(self) -> None:
         """Test default Celery settings."""
-        settings = Settings()
+        settings = _BASE
 
         assert settings.celery_broker_url == "redis://localhost:6379/1"
         assert settings.celery_result_backend == "redis://localhost:6379/2"
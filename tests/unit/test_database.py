@@ -2,6 +2,7 @@
 
 import contextlib
 from collections.abc import AsyncGenerator
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -10,6 +11,30 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from agent_marketplace_api.database import Base, check_database_connection, get_db
 
 
+class _FakeConn:
+    """Async connection stand-in that counts execute calls."""
+
+    def __init__(self) -> None:
+        self.execute_calls = 0
+
+    async def execute(self, *_args: Any, **_kwargs: Any) -> None:
+        self.execute_calls += 1
+
+    async def __aenter__(self) -> "_FakeConn":
+        return self
+
+    async def __aexit__(self, *_args: Any) -> None:
+        return None
+
+
+def make_session_maker(session: AsyncSession) -> MagicMock:
+    """Create a session maker mock whose context manager yields ``session``."""
+    session_maker = MagicMock()
+    session_maker.return_value.__aenter__ = AsyncMock(return_value=session)
+    session_maker.return_value.__aexit__ = AsyncMock(return_value=None)
+    return session_maker
+
+
 class TestBase:
     """Tests for SQLAlchemy Base class."""
 
@@ -22,16 +47,14 @@ class TestBase:
 class TestGetDb:
     """Tests for get_db dependency."""
 
-    @pytest.mark.asyncio
     async def test_get_db_yields_session(self) -> None:
         """Test get_db yields a database session."""
         mock_session = AsyncMock(spec=AsyncSession)
 
-        mock_session_maker = MagicMock()
-        mock_session_maker.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session_maker.return_value.__aexit__ = AsyncMock(return_value=None)
-
-        with patch("agent_marketplace_api.database.async_session_maker", mock_session_maker):
+        with patch(
+            "agent_marketplace_api.database.async_session_maker",
+            make_session_maker(mock_session),
+        ):
             gen = get_db()
             assert isinstance(gen, AsyncGenerator)
 
@@ -44,16 +67,14 @@ class TestGetDb:
 
             mock_session.commit.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_get_db_rollback_on_exception(self) -> None:
         """Test get_db rolls back on exception."""
         mock_session = AsyncMock(spec=AsyncSession)
 
-        mock_session_maker = MagicMock()
-        mock_session_maker.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session_maker.return_value.__aexit__ = AsyncMock(return_value=None)
-
-        with patch("agent_marketplace_api.database.async_session_maker", mock_session_maker):
+        with patch(
+            "agent_marketplace_api.database.async_session_maker",
+            make_session_maker(mock_session),
+        ):
             gen = get_db()
             await gen.__anext__()
 
@@ -67,25 +88,19 @@ class TestGetDb:
 class TestCheckDatabaseConnection:
     """Tests for database connection check."""
 
-    @pytest.mark.asyncio
     async def test_check_connection_success(self) -> None:
         """Test successful database connection check."""
-        mock_conn = AsyncMock()
-
-        mock_context = AsyncMock()
-        mock_context.__aenter__ = AsyncMock(return_value=mock_conn)
-        mock_context.__aexit__ = AsyncMock(return_value=None)
+        fake_conn = _FakeConn()
 
         mock_engine = MagicMock()
-        mock_engine.connect.return_value = mock_context
+        mock_engine.connect.return_value = fake_conn
 
         with patch("agent_marketplace_api.database.async_engine", mock_engine):
             result = await check_database_connection()
 
         assert result is True
-        mock_conn.execute.assert_called_once()
+        assert fake_conn.execute_calls == 1
 
-    @pytest.mark.asyncio
     async def test_check_connection_failure(self) -> None:
         """Test failed database connection check."""
         mock_engine = MagicMock()
@@ -1,16 +1,17 @@
 """Unit tests for API dependencies."""
 
-from unittest.mock import AsyncMock
+from collections.abc import AsyncGenerator
 
 import pytest
 from fastapi import HTTPException
 from fastapi.security import HTTPAuthorizationCredentials
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from agent_marketplace_api.api.deps import get_current_user, get_optional_user
 from agent_marketplace_api.models import User
 from agent_marketplace_api.security import create_access_token
-from agent_marketplace_api.services.user_service import UserNotFoundError, UserService
+from agent_marketplace_api.services.user_service import UserNotFoundError
+from tests.conftest import FakeUserService
 
 
 def make_credentials(token: str) -> HTTPAuthorizationCredentials:
@@ -18,26 +19,33 @@ def make_credentials(token: str) -> HTTPAuthorizationCredentials:
     return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
 
 
-@pytest.fixture
-async def sample_user(db_session: AsyncSession) -> User:
-    """Create a sample user in the database."""
-    user = User(
-        github_id=12345,
-        username="testuser",
-        email="test@example.com",
-        avatar_url="https://example.com/avatar.png",
-        bio="Test bio",
-    )
-    db_session.add(user)
-    await db_session.flush()
-    await db_session.refresh(user)
-    return user
+@pytest.fixture(scope="module")
+async def sample_user(db_connection: AsyncConnection) -> AsyncGenerator[User, None]:
+    """Create a sample user once for the module inside its own SAVEPOINT."""
+    savepoint = await db_connection.begin_nested()
+    async with AsyncSession(
+        bind=db_connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    ) as session:
+        user = User(
+            github_id=12345,
+            username="testuser",
+            email="test@example.com",
+            avatar_url="https://example.com/avatar.png",
+            bio="Test bio",
+        )
+        session.add(user)
+        await session.commit()
+
+    yield user
+
+    await savepoint.rollback()
 
 
 class TestGetCurrentUser:
     """Tests for get_current_user dependency."""
 
-    @pytest.mark.asyncio
     async def test_missing_sub_in_token(
         self,
         db_session: AsyncSession,  # noqa: ARG002
@@ -47,16 +55,15 @@ class TestGetCurrentUser:
         token = create_access_token({"username": "testuser"})
         credentials = make_credentials(token)
 
-        mock_service = AsyncMock(spec=UserService)
+        fake_service = FakeUserService()
 
         with pytest.raises(HTTPException) as exc_info:
-            await get_current_user(credentials, mock_service)
+            await get_current_user(credentials, fake_service)
 
         assert exc_info.value.status_code == 401
         # The HTTPException for missing sub gets caught by generic handler
         assert "Could not validate credentials" in exc_info.value.detail
 
-    @pytest.mark.asyncio
     async def test_generic_exception_handler(
         self,
         sample_user: User,
@@ -65,17 +72,15 @@ class TestGetCurrentUser:
         token = create_access_token({"sub": str(sample_user.id), "username": sample_user.username})
         credentials = make_credentials(token)
 
-        # Create a mock service that raises an unexpected exception
-        mock_service = AsyncMock(spec=UserService)
-        mock_service.get_user_by_id.side_effect = ValueError("Unexpected error")
+        # Create a fake service that raises an unexpected exception
+        fake_service = FakeUserService(exc=ValueError("Unexpected error"))
 
         with pytest.raises(HTTPException) as exc_info:
-            await get_current_user(credentials, mock_service)
+            await get_current_user(credentials, fake_service)
 
         assert exc_info.value.status_code == 401
         assert "Could not validate credentials" in exc_info.value.detail
 
-    @pytest.mark.asyncio
     async def test_user_not_found_raises_generic_exception(
         self,
         db_session: AsyncSession,  # noqa: ARG002
@@ -84,11 +89,10 @@ class TestGetCurrentUser:
         token = create_access_token({"sub": "99999", "username": "nonexistent"})
         credentials = make_credentials(token)
 
-        mock_service = AsyncMock(spec=UserService)
-        mock_service.get_user_by_id.side_effect = UserNotFoundError("User not found")
+        fake_service = FakeUserService(exc=UserNotFoundError("User not found"))
 
         with pytest.raises(HTTPException) as exc_info:
-            await get_current_user(credentials, mock_service)
+            await get_current_user(credentials, fake_service)
 
         assert exc_info.value.status_code == 401
         assert "Could not validate credentials" in exc_info.value.detail
@@ -97,20 +101,18 @@ class TestGetCurrentUser:
 class TestGetOptionalUser:
     """Tests for get_optional_user dependency."""
 
-    @pytest.mark.asyncio
     async def test_no_token_returns_none(
         self,
         db_session: AsyncSession,  # noqa: ARG002
     ) -> None:
         """Test that missing token returns None."""
-        mock_service = AsyncMock(spec=UserService)
+        fake_service = FakeUserService()
 
-        result = await get_optional_user(None, mock_service)
+        result = await get_optional_user(None, fake_service)
 
         assert result is None
-        mock_service.get_user_by_id.assert_not_called()
+        assert fake_service.called_with is None
 
-    @pytest.mark.asyncio
     async def test_valid_token_returns_user(
         self,
         sample_user: User,
@@ -119,29 +121,26 @@ class TestGetOptionalUser:
         token = create_access_token({"sub": str(sample_user.id), "username": sample_user.username})
         credentials = make_credentials(token)
 
-        mock_service = AsyncMock(spec=UserService)
-        mock_service.get_user_by_id.return_value = sample_user
+        fake_service = FakeUserService(user=sample_user)
 
-        result = await get_optional_user(credentials, mock_service)
+        result = await get_optional_user(credentials, fake_service)
 
         assert result == sample_user
-        mock_service.get_user_by_id.assert_called_once_with(sample_user.id)
+        assert fake_service.called_with == sample_user.id
 
-    @pytest.mark.asyncio
     async def test_invalid_token_returns_none(
         self,
         db_session: AsyncSession,  # noqa: ARG002
     ) -> None:
         """Test that invalid token returns None instead of raising."""
         credentials = make_credentials("invalid.token.here")
-        mock_service = AsyncMock(spec=UserService)
+        fake_service = FakeUserService()
 
-        result = await get_optional_user(credentials, mock_service)
+        result = await get_optional_user(credentials, fake_service)
 
         assert result is None
-        mock_service.get_user_by_id.assert_not_called()
+        assert fake_service.called_with is None
 
-    @pytest.mark.asyncio
     async def test_expired_token_returns_none(
         self,
         sample_user: User,
@@ -155,14 +154,13 @@ class TestGetOptionalUser:
         )
         credentials = make_credentials(token)
 
-        mock_service = AsyncMock(spec=UserService)
+        fake_service = FakeUserService()
 
-        result = await get_optional_user(credentials, mock_service)
+        result = await get_optional_user(credentials, fake_service)
 
         assert result is None
-        mock_service.get_user_by_id.assert_not_called()
+        assert fake_service.called_with is None
 
-    @pytest.mark.asyncio
     async def test_missing_sub_returns_none(
         self,
         db_session: AsyncSession,  # noqa: ARG002
@@ -171,14 +169,13 @@ class TestGetOptionalUser:
         token = create_access_token({"username": "testuser"})
         credentials = make_credentials(token)
 
-        mock_service = AsyncMock(spec=UserService)
+        fake_service = FakeUserService()
 
-        result = await get_optional_user(credentials, mock_service)
+        result = await get_optional_user(credentials, fake_service)
 
         assert result is None
-        mock_service.get_user_by_id.assert_not_called()
+        assert fake_service.called_with is None
 
-    @pytest.mark.asyncio
     async def test_user_not_found_returns_none(
         self,
         db_session: AsyncSession,  # noqa: ARG002
@@ -187,9 +184,8 @@ class TestGetOptionalUser:
         token = create_access_token({"sub": "99999", "username": "nonexistent"})
         credentials = make_credentials(token)
 
-        mock_service = AsyncMock(spec=UserService)
-        mock_service.get_user_by_id.side_effect = UserNotFoundError("User not found")
+        fake_service = FakeUserService(exc=UserNotFoundError("User not found"))
 
-        result = await get_optional_user(credentials, mock_service)
+        result = await get_optional_user(credentials, fake_service)
 
         assert result is None
@@ -0,0 +1,63 @@
+"""Unit tests for shared HTTP client pool."""
+
+import httpx
+
+from agent_marketplace_api.http_client import HTTPClientPool, get_http_pool
+
+
+class TestHTTPClientPool:
+    """Tests for HTTPClientPool."""
+
+    async def test_client_is_reused(self) -> None:
+        """Test the same client is returned until the pool is closed."""
+        pool = HTTPClientPool()
+
+        assert pool.client is pool.client
+
+        await pool.aclose()
+
+    async def test_client_recreated_after_close(self) -> None:
+        """Test a fresh client is created after aclose()."""
+        pool = HTTPClientPool()
+        first = pool.client
+
+        await pool.aclose()
+
+        assert first.is_closed
+        second = pool.client
+        assert second is not first
+        assert not second.is_closed
+
+        await pool.aclose()
+
+    async def test_client_kwargs_forwarded(self) -> None:
+        """Test keyword arguments are passed to the AsyncClient."""
+        transport = httpx.MockTransport(lambda _request: httpx.Response(204))
+        pool = HTTPClientPool(transport=transport)
+
+        response = await pool.client.get("https://example.com/")
+
+        assert response.status_code == 204
+
+        await pool.aclose()
+
+    async def test_aclose_without_client(self) -> None:
+        """Test closing an unused pool is a no-op."""
+        pool = HTTPClientPool()
+
+        await pool.aclose()
+
+
+class TestGetHTTPPool:
+    """Tests for get_http_pool singleton."""
+
+    def test_returns_singleton(self) -> None:
+        """Test that get_http_pool returns same instance."""
+        import agent_marketplace_api.http_client as http_client_module
+
+        http_client_module._http_pool = None
+
+        pool1 = get_http_pool()
+        pool2 = get_http_pool()
+
+        assert pool1 is pool2
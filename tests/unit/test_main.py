@@ -1,17 +1,36 @@
 """Tests for main FastAPI application."""
 
+from collections.abc import AsyncGenerator
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import pytest
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient, Response
 
 from agent_marketplace_api.main import app, lifespan
 
 
+@pytest.fixture(scope="module")
+async def client() -> AsyncGenerator[AsyncClient, None]:
+    """HTTP client shared by every test in this module.
+
+    None of these endpoints touch the database session, so one client
+    with the health check patched is reused instead of the per-test
+    client from conftest.
+    """
+    with patch(
+        "agent_marketplace_api.main.check_database_connection",
+        new_callable=AsyncMock,
+        return_value=True,
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            yield ac
+
+
 class TestLifespan:
     """Tests for application lifespan."""
 
-    @pytest.mark.asyncio
     async def test_lifespan_disposes_engine(self) -> None:
         """Test lifespan disposes engine on shutdown."""
         mock_engine = AsyncMock()
@@ -23,30 +42,27 @@ class TestLifespan:
             mock_engine.dispose.assert_called_once()
 
 
+@pytest.fixture(scope="module")
+async def health_response(client: AsyncClient) -> Response:
+    """Single /health response shared by the healthy-path assertions."""
+    return await client.get("/health")
+
+
 class TestHealthCheck:
     """Tests for health check endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_health_check_healthy(self, client: AsyncClient) -> None:
+    def test_health_check_healthy(self, health_response: Response) -> None:
         """Test health check returns healthy status."""
-        response = await client.get("/health")
-
-        assert response.status_code == 200
-        data = response.json()
+        assert health_response.status_code == 200
+        data = health_response.json()
         assert data["status"] == "healthy"
         assert "version" in data
         assert data["database"] == "connected"
 
-    @pytest.mark.asyncio
-    async def test_health_check_includes_environment(self, client: AsyncClient) -> None:
+    def test_health_check_includes_environment(self, health_response: Response) -> None:
         """Test health check includes environment info."""
-        response = await client.get("/health")
+        assert "environment" in health_response.json()
 
-        assert response.status_code == 200
-        data = response.json()
-        assert "environment" in data
-
-    @pytest.mark.asyncio
     async def test_health_check_unhealthy_database(self, client: AsyncClient) -> None:
         """Test health check returns unhealthy when database is down."""
         with patch(
@@ -65,7 +81,6 @@ class TestHealthCheck:
 class TestRootEndpoint:
     """Tests for root endpoint."""
 
-    @pytest.mark.asyncio
     async def test_root_returns_app_info(self, client: AsyncClient) -> None:
         """Test root endpoint returns application info."""
         response = await client.get("/")
@@ -77,10 +92,15 @@ class TestRootEndpoint:
         assert data["docs"] == "/docs"
 
 
+@pytest.fixture(scope="module")
+def openapi_schema() -> dict[str, Any]:
+    """OpenAPI schema generated once; FastAPI caches it on the app afterwards."""
+    return app.openapi()
+
+
 class TestOpenAPI:
     """Tests for OpenAPI documentation."""
 
-    @pytest.mark.asyncio
     async def test_openapi_available(self, client: AsyncClient) -> None:
         """Test OpenAPI schema is available."""
         response = await client.get("/api/v1/openapi.json")
@@ -90,18 +110,15 @@ class TestOpenAPI:
         assert "openapi" in data
         assert "info" in data
 
-    @pytest.mark.asyncio
-    async def test_docs_available(self, client: AsyncClient) -> None:
-        """Test Swagger docs are available."""
-        response = await client.get("/docs")
-
-        assert response.status_code == 200
-        assert "text/html" in response.headers["content-type"]
+    def test_openapi_lists_api_routes(self, openapi_schema: dict[str, Any]) -> None:
+        """Test the schema documents routes under the API prefix."""
+        assert openapi_schema["info"]["title"] == app.title
+        assert any(path.startswith("/api/v1/agents") for path in openapi_schema["paths"])
 
-    @pytest.mark.asyncio
-    async def test_redoc_available(self, client: AsyncClient) -> None:
-        """Test ReDoc is available."""
-        response = await client.get("/redoc")
+    @pytest.mark.parametrize("path", ["/docs", "/redoc"])
+    async def test_docs_available(self, client: AsyncClient, path: str) -> None:
+        """Test Swagger UI and ReDoc pages are available."""
+        response = await client.get(path)
 
         assert response.status_code == 200
         assert "text/html" in response.headers["content-type"]
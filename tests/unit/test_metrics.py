@@ -1,22 +1,32 @@
 """Unit tests for Prometheus metrics."""
 
+import threading
+from collections.abc import AsyncIterator
+from unittest.mock import patch
+
 import pytest
-from fastapi import FastAPI
-from fastapi.testclient import TestClient
-from prometheus_client import CONTENT_TYPE_LATEST
+from fastapi import FastAPI, Request, Response
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram
 
 from agent_marketplace_api.core.metrics import (
+    _HTTP_REQUESTS_BUFFER,
     AGENT_DOWNLOADS_TOTAL,
     AGENT_UPLOADS_TOTAL,
     AGENTS_GAUGE,
+    HTTP_REQUEST_DURATION_SECONDS,
     HTTP_REQUESTS_TOTAL,
     PENDING_VALIDATIONS_GAUGE,
     REVIEWS_TOTAL,
     STARS_TOTAL,
     USERS_GAUGE,
+    VALIDATION_DURATION_SECONDS,
+    BufferedCounter,
+    BufferedHistogram,
     MetricsMiddleware,
     get_metric_value,
     get_metrics,
+    get_metrics_cached,
     track_agent_download,
     track_agent_upload,
     track_review,
@@ -28,26 +38,70 @@ from agent_marketplace_api.core.metrics import (
 )
 
 
+def _child(metric: Counter, **labels: str) -> Counter:
+    """Resolve a labelled child once so tests can read its value directly."""
+    return metric.labels(**labels)
+
+
+@pytest.fixture(scope="module")
+def metrics_snapshot() -> tuple[bytes, str]:
+    """One serialized registry shared by the output-format tests."""
+    return get_metrics()
+
+
 class TestGetMetrics:
     """Tests for get_metrics function."""
 
-    def test_returns_bytes_and_content_type(self) -> None:
+    def test_returns_bytes_and_content_type(self, metrics_snapshot: tuple[bytes, str]) -> None:
         """Test get_metrics returns bytes and content type."""
-        content, content_type = get_metrics()
+        content, content_type = metrics_snapshot
 
         assert isinstance(content, bytes)
         assert content_type == CONTENT_TYPE_LATEST
 
-    def test_contains_metric_names(self) -> None:
+    def test_contains_metric_names(self, metrics_snapshot: tuple[bytes, str]) -> None:
         """Test metrics output contains expected metric names."""
-        content, _ = get_metrics()
-        content_str = content.decode("utf-8")
+        content_str = metrics_snapshot[0].decode("utf-8")
 
         # Check for presence of metric names
         assert "http_requests_total" in content_str
         assert "http_request_duration_seconds" in content_str
         assert "agent_uploads_total" in content_str
         assert "agent_downloads_total" in content_str
+        assert "validation_duration_seconds" in content_str
+
+    def test_known_series_exported_before_first_use(
+        self, metrics_snapshot: tuple[bytes, str]
+    ) -> None:
+        """Test fixed-label series are pre-created rather than on first hit."""
+        content_str = metrics_snapshot[0].decode("utf-8")
+
+        assert 'agent_uploads_total{status="failure"}' in content_str
+        assert 'reviews_total{rating="3"}' in content_str
+        assert 'stars_total{operation="unstar"}' in content_str
+        assert 'agents_count{status="validated"}' in content_str
+        assert 'users_count{status="active"}' in content_str
+
+
+class TestGetMetricsCached:
+    """Tests for get_metrics_cached function."""
+
+    def test_reuses_recent_scrape(self) -> None:
+        """Test a scrape within max_age_ms is served from the cache."""
+        first, content_type = get_metrics_cached(max_age_ms=60_000)
+        track_agent_upload(success=True)
+        second, _ = get_metrics_cached(max_age_ms=60_000)
+
+        assert second is first
+        assert content_type == CONTENT_TYPE_LATEST
+
+    def test_refreshes_stale_scrape(self) -> None:
+        """Test a zero max age always regenerates changed output."""
+        first, _ = get_metrics_cached(max_age_ms=0)
+        track_agent_upload(success=True)
+        second, _ = get_metrics_cached(max_age_ms=0)
+
+        assert second is not first
 
 
 class TestTrackAgentUpload:
@@ -55,19 +109,19 @@ class TestTrackAgentUpload:
 
     def test_tracks_successful_upload(self) -> None:
         """Test tracking successful upload."""
-        initial = get_metric_value(AGENT_UPLOADS_TOTAL, {"status": "success"})
+        child = _child(AGENT_UPLOADS_TOTAL, status="success")
+        initial = child._value.get()
         track_agent_upload(success=True)
-        final = get_metric_value(AGENT_UPLOADS_TOTAL, {"status": "success"})
 
-        assert final == initial + 1
+        assert child._value.get() == initial + 1
 
     def test_tracks_failed_upload(self) -> None:
         """Test tracking failed upload."""
-        initial = get_metric_value(AGENT_UPLOADS_TOTAL, {"status": "failure"})
+        child = _child(AGENT_UPLOADS_TOTAL, status="failure")
+        initial = child._value.get()
         track_agent_upload(success=False)
-        final = get_metric_value(AGENT_UPLOADS_TOTAL, {"status": "failure"})
 
-        assert final == initial + 1
+        assert child._value.get() == initial + 1
 
 
 class TestTrackAgentDownload:
@@ -76,11 +130,17 @@ class TestTrackAgentDownload:
     def test_tracks_download(self) -> None:
         """Test tracking download by agent slug."""
         slug = "test-agent-download"
-        initial = get_metric_value(AGENT_DOWNLOADS_TOTAL, {"agent_slug": slug})
+        child = _child(AGENT_DOWNLOADS_TOTAL, agent_slug=slug)
+        initial = child._value.get()
         track_agent_download(slug)
-        final = get_metric_value(AGENT_DOWNLOADS_TOTAL, {"agent_slug": slug})
 
-        assert final == initial + 1
+        assert child._value.get() == initial + 1
+
+    def test_reuses_child_for_same_slug(self) -> None:
+        """Test repeated downloads of a slug reuse one cached counter child."""
+        from agent_marketplace_api.core.metrics import _download_child
+
+        assert _download_child("cached-agent") is _download_child("cached-agent")
 
 
 class TestTrackReview:
@@ -89,11 +149,19 @@ class TestTrackReview:
     def test_tracks_review_by_rating(self) -> None:
         """Test tracking review with rating."""
         rating = 5
-        initial = get_metric_value(REVIEWS_TOTAL, {"rating": str(rating)})
+        child = _child(REVIEWS_TOTAL, rating=str(rating))
+        initial = child._value.get()
         track_review(rating)
-        final = get_metric_value(REVIEWS_TOTAL, {"rating": str(rating)})
 
-        assert final == initial + 1
+        assert child._value.get() == initial + 1
+
+    def test_tracks_review_with_unexpected_rating(self) -> None:
+        """Test ratings outside 1-5 still get their own label."""
+        child = _child(REVIEWS_TOTAL, rating="0")
+        initial = child._value.get()
+        track_review(0)
+
+        assert child._value.get() == initial + 1
 
 
 class TestTrackStar:
@@ -101,19 +169,128 @@ class TestTrackStar:
 
     def test_tracks_star_operation(self) -> None:
         """Test tracking star operation."""
-        initial = get_metric_value(STARS_TOTAL, {"operation": "star"})
+        child = _child(STARS_TOTAL, operation="star")
+        initial = child._value.get()
         track_star("star")
-        final = get_metric_value(STARS_TOTAL, {"operation": "star"})
 
-        assert final == initial + 1
+        assert child._value.get() == initial + 1
 
     def test_tracks_unstar_operation(self) -> None:
         """Test tracking unstar operation."""
-        initial = get_metric_value(STARS_TOTAL, {"operation": "unstar"})
+        child = _child(STARS_TOTAL, operation="unstar")
+        initial = child._value.get()
         track_star("unstar")
-        final = get_metric_value(STARS_TOTAL, {"operation": "unstar"})
 
-        assert final == initial + 1
+        assert child._value.get() == initial + 1
+
+    def test_tracks_unknown_operation(self) -> None:
+        """Test operations other than star/unstar are still recorded."""
+        child = _child(STARS_TOTAL, operation="other")
+        initial = child._value.get()
+        track_star("other")
+
+        assert child._value.get() == initial + 1
+
+
+class TestBufferedCounter:
+    """Tests for BufferedCounter."""
+
+    @pytest.fixture
+    def counter(self) -> Counter:
+        """Standalone labelled counter on its own registry."""
+        return Counter("buffered_test", "Buffered test", ["kind"], registry=CollectorRegistry())
+
+    def test_buffers_until_threshold(self, counter: Counter) -> None:
+        """Test increments reach the counter only once the threshold is hit."""
+        buffered = BufferedCounter(counter, flush_every=3)
+
+        buffered.inc("a")
+        buffered.inc("a")
+        assert counter.labels(kind="a")._value.get() == 0
+
+        buffered.inc("a")
+        assert counter.labels(kind="a")._value.get() == 3
+
+    def test_standalone_buffer_not_flushed_globally(self, counter: Counter) -> None:
+        """Test buffers only take part in scrape-time flushes when listed explicitly."""
+        buffered = BufferedCounter(counter)
+        buffered.inc("b")
+
+        get_metrics()
+
+        assert counter.labels(kind="b")._value.get() == 0
+
+    def test_flush_collects_other_threads(self, counter: Counter) -> None:
+        """Test flush applies increments buffered by other threads."""
+        buffered = BufferedCounter(counter)
+
+        def worker() -> None:
+            for _ in range(10):
+                buffered.inc("threaded")
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.labels(kind="threaded")._value.get() == 0
+        buffered.flush()
+        assert counter.labels(kind="threaded")._value.get() == 40
+
+    def test_get_metrics_flushes(self) -> None:
+        """Test scraping applies pending request increments first."""
+        child = HTTP_REQUESTS_TOTAL.labels(method="GET", endpoint="/scraped", status="200")
+        _HTTP_REQUESTS_BUFFER.inc("GET", "/scraped", "200", amount=2)
+
+        get_metrics()
+
+        assert child._value.get() == 2
+
+    def test_get_metric_value_flushes(self) -> None:
+        """Test get_metric_value sees request increments that are still buffered."""
+        _HTTP_REQUESTS_BUFFER.inc("GET", "/read", "200")
+
+        labels = {"method": "GET", "endpoint": "/read", "status": "200"}
+        assert get_metric_value(HTTP_REQUESTS_TOTAL, labels) == 1
+
+
+class TestBufferedHistogram:
+    """Tests for BufferedHistogram."""
+
+    @pytest.fixture
+    def histogram(self) -> Histogram:
+        """Standalone labelled histogram on its own registry."""
+        return Histogram(
+            "buffered_test_seconds", "Buffered test", ["kind"], registry=CollectorRegistry()
+        )
+
+    def test_buffers_until_threshold(self, histogram: Histogram) -> None:
+        """Test observations reach the histogram only once the threshold is hit."""
+        buffered = BufferedHistogram(histogram, flush_every=2)
+
+        buffered.observe("a", value=1.5)
+        assert histogram.labels(kind="a")._sum.get() == 0
+
+        buffered.observe("a", value=2.5)
+        assert histogram.labels(kind="a")._sum.get() == 4.0
+
+    def test_flush_replays_each_observation(self, histogram: Histogram) -> None:
+        """Test flushing keeps per-observation bucket counts."""
+        buffered = BufferedHistogram(histogram)
+        for value in (0.1, 0.1, 20.0):
+            buffered.observe("b", value=value)
+        buffered.flush()
+
+        assert get_metric_value(histogram, {"kind": "b"}) == pytest.approx(20.2)
+        buckets = {
+            sample.labels["le"]: sample.value
+            for metric in histogram.collect()
+            for sample in metric.samples
+            if sample.name.endswith("_bucket") and sample.labels["kind"] == "b"
+        }
+        assert buckets["0.1"] == 2
+        assert buckets["+Inf"] == 3
 
 
 class TestTrackValidation:
@@ -124,12 +301,11 @@ class TestTrackValidation:
         validator_type = "security"
         duration = 5.5
 
-        # This will add to the histogram
+        initial = get_metric_value(VALIDATION_DURATION_SECONDS, {"validator_type": validator_type})
         track_validation(validator_type, duration)
+        final = get_metric_value(VALIDATION_DURATION_SECONDS, {"validator_type": validator_type})
 
-        # Verify the metric exists in output
-        content, _ = get_metrics()
-        assert b"validation_duration_seconds" in content
+        assert final == initial + duration
 
 
 class TestUpdateAgentGauge:
@@ -168,17 +344,19 @@ class TestUpdatePendingValidationsGauge:
 class TestMetricsMiddleware:
     """Tests for MetricsMiddleware."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def app_with_middleware(self) -> FastAPI:
         """Create test app with metrics middleware."""
         app = FastAPI()
         app.add_middleware(MetricsMiddleware)
 
         @app.get("/test")
+        @pytest.mark.asyncio
         async def test_endpoint() -> dict[str, str]:
             return {"status": "ok"}
 
         @app.get("/test/{id}")
+        @pytest.mark.asyncio
         async def test_with_id(id: int) -> dict[str, int]:
             return {"id": id}
 
@@ -188,16 +366,22 @@ class TestMetricsMiddleware:
 
         return app
 
-    def test_tracks_request_count(self, app_with_middleware: FastAPI) -> None:
-        """Test middleware tracks request count."""
-        client = TestClient(app_with_middleware)
+    @pytest.fixture(scope="module")
+    async def client(self, app_with_middleware: FastAPI) -> AsyncIterator[AsyncClient]:
+        """In-process async client shared by the middleware tests."""
+        transport = ASGITransport(app=app_with_middleware)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
 
+    @pytest.mark.asyncio
+    async def test_tracks_request_count(self, client: AsyncClient) -> None:
+        """Test middleware tracks request count."""
         initial = get_metric_value(
             HTTP_REQUESTS_TOTAL,
             {"method": "GET", "endpoint": "/test", "status": "200"},
         )
 
-        client.get("/test")
+        await client.get("/test")
 
         final = get_metric_value(
             HTTP_REQUESTS_TOTAL,
@@ -206,26 +390,26 @@ class TestMetricsMiddleware:
 
         assert final == initial + 1
 
-    def test_tracks_request_duration(self, app_with_middleware: FastAPI) -> None:
+    @pytest.mark.asyncio
+    async def test_tracks_request_duration(self, client: AsyncClient) -> None:
         """Test middleware tracks request duration."""
-        client = TestClient(app_with_middleware)
+        labels = {"method": "GET", "endpoint": "/test"}
+        initial = get_metric_value(HTTP_REQUEST_DURATION_SECONDS, labels)
 
-        client.get("/test")
+        await client.get("/test")
 
         # Verify duration was recorded
-        content, _ = get_metrics()
-        assert b"http_request_duration_seconds" in content
+        assert get_metric_value(HTTP_REQUEST_DURATION_SECONDS, labels) > initial
 
-    def test_skips_metrics_endpoint(self, app_with_middleware: FastAPI) -> None:
+    @pytest.mark.asyncio
+    async def test_skips_metrics_endpoint(self, client: AsyncClient) -> None:
         """Test middleware skips /metrics endpoint."""
-        client = TestClient(app_with_middleware)
-
         initial_count = get_metric_value(
             HTTP_REQUESTS_TOTAL,
             {"method": "GET", "endpoint": "/metrics", "status": "200"},
         )
 
-        client.get("/metrics")
+        await client.get("/metrics")
 
         final_count = get_metric_value(
             HTTP_REQUESTS_TOTAL,
@@ -235,17 +419,25 @@ class TestMetricsMiddleware:
         # Count should not change for /metrics endpoint
         assert final_count == initial_count
 
-    def test_normalizes_path_with_id(self, app_with_middleware: FastAPI) -> None:
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_bypasses_dispatch(self, client: AsyncClient) -> None:
+        """Test /metrics is passed through before dispatch builds a Request."""
+        with patch.object(MetricsMiddleware, "dispatch") as dispatch:
+            response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        dispatch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_normalizes_path_with_id(self, client: AsyncClient) -> None:
         """Test middleware normalizes paths with IDs."""
-        client = TestClient(app_with_middleware)
+        labels = {"method": "GET", "endpoint": "/test/{id}", "status": "200"}
+        initial = get_metric_value(HTTP_REQUESTS_TOTAL, labels)
 
-        client.get("/test/123")
+        await client.get("/test/123")
 
         # The path should be normalized to /test/{id}
-        content, _ = get_metrics()
-        content_str = content.decode("utf-8")
-        # Check that we're tracking with normalized path
-        assert "http_requests_total" in content_str
+        assert get_metric_value(HTTP_REQUESTS_TOTAL, labels) == initial + 1
 
 
 class TestMetricsMiddlewarePathNormalization:
@@ -338,7 +530,6 @@ class TestGetMetricValue:
 
     def test_gets_histogram_value(self) -> None:
         """Test getting histogram value with labels."""
-        from agent_marketplace_api.core.metrics import VALIDATION_DURATION_SECONDS
 
         # Record some values to the histogram
         track_validation("security", 5.0)
@@ -360,38 +551,43 @@ class TestGetMetricValue:
 class TestMetricsEndpointIntegration:
     """Integration tests for /metrics endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_metrics_endpoint(self) -> None:
-        """Test /metrics endpoint returns Prometheus metrics."""
-        from httpx import ASGITransport, AsyncClient
-
+    @pytest.fixture(scope="module")
+    async def api_client(self) -> AsyncIterator[AsyncClient]:
+        """Async client for the main app, shared across the module."""
         from agent_marketplace_api.main import app
 
         async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-            response = await client.get("/metrics")
+            yield client
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self, api_client: AsyncClient) -> None:
+        """Test /metrics endpoint returns Prometheus metrics."""
+        response = await api_client.get("/metrics")
 
-            assert response.status_code == 200
-            assert "text/plain" in response.headers["content-type"]
-            # Check for metric names in response
-            assert b"http_requests_total" in response.content
+        assert response.status_code == 200
+        assert "text/plain" in response.headers["content-type"]
+        # Check for metric names in response
+        assert b"http_requests_total" in response.content
 
 
 class TestMetricsMiddlewareExceptionHandling:
     """Tests for exception handling in MetricsMiddleware."""
 
-    def test_handles_exception_in_endpoint(self) -> None:
+    @pytest.mark.asyncio
+    async def test_handles_exception_in_endpoint(self) -> None:
         """Test middleware records 500 status on exception."""
-        app = FastAPI()
-        app.add_middleware(MetricsMiddleware)
+        middleware = MetricsMiddleware(None)  # type: ignore[arg-type]
+        request = Request({"type": "http", "method": "GET", "path": "/error", "headers": []})
+        labels = {"method": "GET", "endpoint": "/error", "status": "500"}
+        initial = get_metric_value(HTTP_REQUESTS_TOTAL, labels)
 
-        @app.get("/error")
-        async def error_endpoint() -> dict[str, str]:
+        async def raise_error(_request: Request) -> Response:
             raise ValueError("Test error")
 
-        client = TestClient(app, raise_server_exceptions=False)
-        response = client.get("/error")
+        with pytest.raises(ValueError, match="Test error"):
+            await middleware.dispatch(request, raise_error)
 
-        assert response.status_code == 500
+        assert get_metric_value(HTTP_REQUESTS_TOTAL, labels) == initial + 1
 
 
 class TestMetricsMiddlewarePathNormalizationExtended:
@@ -453,3 +649,32 @@ class TestMetricsMiddlewarePathNormalizationExtended:
         normalized = middleware._normalize_path(path)
 
         assert normalized == "/api/v1/agents/versions"
+
+    def test_collapses_empty_segments(self) -> None:
+        """Test repeated and trailing slashes share a label with the clean path."""
+        middleware = MetricsMiddleware(None)  # type: ignore[arg-type]
+
+        assert middleware._normalize_path("/api//v1/agents/my-agent/") == "/api/v1/agents/{slug}"
+        assert middleware._normalize_path("/") == "/"
+
+    def test_id_after_chained_collection(self) -> None:
+        """Test a numeric segment after a keyword collection becomes an ID."""
+        middleware = MetricsMiddleware(None)  # type: ignore[arg-type]
+
+        path = "/api/v1/agents/reviews/5"
+        normalized = middleware._normalize_path(path)
+
+        assert normalized == "/api/v1/agents/reviews/{id}"
+
+    def test_normalization_is_cached(self) -> None:
+        """Test repeated paths are served from the normalization cache."""
+        from agent_marketplace_api.core.metrics import _normalize_path
+
+        middleware = MetricsMiddleware(None)  # type: ignore[arg-type]
+        path = "/api/v1/agents/cached-agent"
+
+        middleware._normalize_path(path)
+        hits = _normalize_path.cache_info().hits
+        middleware._normalize_path(path)
+
+        assert _normalize_path.cache_info().hits == hits + 1
@@ -7,6 +7,7 @@ import pytest
 from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from agent_marketplace_api.database import Base
 from agent_marketplace_api.models import (
     Agent,
     AgentVersion,
@@ -52,6 +53,21 @@ class TestUserModel:
         user = User(id=1, username="testuser", github_id=123, email="test@example.com")
         assert repr(user) == "<User(id=1, username='testuser')>"
 
+    def test_user_repr_before_flush(self) -> None:
+        """Test repr of a transient User without an ID."""
+        user = User(username="testuser", github_id=123, email="test@example.com")
+        assert repr(user) == "<User(id=None, username='testuser')>"
+
+    def test_user_search_indexes_postgres_only(self) -> None:
+        """Test trigram search indexes cover username and bio on Postgres only."""
+        indexes = {str(ix.name): ix for ix in Base.metadata.tables["users"].indexes}
+        trgm = indexes["ix_users_bio_trgm"]
+
+        assert trgm.dialect_options["postgresql"]["ops"] == {"bio": "gin_trgm_ops"}
+        assert "ix_users_username_trgm" in indexes
+        assert trgm._ddl_if is not None
+        assert trgm._ddl_if.dialect == "postgresql"
+
     @pytest.mark.asyncio
     async def test_user_create(self, db_session: AsyncSession) -> None:
         """Test creating a user in database."""
@@ -110,6 +126,27 @@ class TestAgentModel:
         )
         assert repr(agent) == "<Agent(id=1, slug='test-agent')>"
 
+    def test_agent_search_indexes_postgres_only(self) -> None:
+        """Test trigram search indexes compile for Postgres and are skipped elsewhere."""
+        indexes = {str(ix.name): ix for ix in Base.metadata.tables["agents"].indexes}
+        trgm = indexes["ix_agents_name_trgm"]
+        pg_options = trgm.dialect_options["postgresql"]
+
+        assert pg_options["using"] == "gin"
+        assert pg_options["ops"] == {"name": "gin_trgm_ops"}
+        assert {"ix_agents_description_trgm", "ix_agents_slug_trgm"} <= indexes.keys()
+        assert trgm._ddl_if is not None
+        assert trgm._ddl_if.dialect == "postgresql"
+
+    def test_agent_name_prefix_index_postgres_only(self) -> None:
+        """Test the suggestion prefix index targets lower(name) with text_pattern_ops."""
+        indexes = {str(ix.name): ix for ix in Base.metadata.tables["agents"].indexes}
+        prefix = indexes["ix_agents_name_prefix"]
+
+        assert [str(expr) for expr in prefix.expressions] == ["lower(name) text_pattern_ops"]
+        assert prefix._ddl_if is not None
+        assert prefix._ddl_if.dialect == "postgresql"
+
     @pytest.mark.asyncio
     async def test_agent_create_with_user(self, db_session: AsyncSession) -> None:
         """Test creating an agent with a user."""
@@ -271,17 +308,15 @@ class TestAssociationTables:
 
         user = User(github_id=123, username="user", email="user@example.com")
         author = User(github_id=456, username="author", email="author@example.com")
-        db_session.add_all([user, author])
-        await db_session.flush()
-
         agent = Agent(
             name="Test",
             slug="test",
             description="Test agent",
-            author_id=author.id,
+            author=author,
             current_version="1.0.0",
         )
-        db_session.add(agent)
+        # One flush; the unit of work orders the user inserts before the agent
+        db_session.add_all([user, author, agent])
         await db_session.flush()
 
         # Star the agent via association table
@@ -303,21 +338,15 @@ class TestAssociationTables:
         from sqlalchemy import insert, select
 
         user = User(github_id=123, username="author", email="author@example.com")
-        db_session.add(user)
-        await db_session.flush()
-
         category = Category(name="Testing", slug="testing")
-        db_session.add(category)
-        await db_session.flush()
-
         agent = Agent(
             name="Test",
             slug="test",
             description="Test agent",
-            author_id=user.id,
+            author=user,
             current_version="1.0.0",
         )
-        db_session.add(agent)
+        db_session.add_all([user, category, agent])
         await db_session.flush()
 
         # Link agent to category via association table
@@ -1,6 +1,7 @@
 """Unit tests for review repositories."""
 
 import pytest
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from agent_marketplace_api.models import User
@@ -65,19 +66,32 @@ async def test_review(db_session: AsyncSession, test_agent: Agent, test_user: Us
     return review
 
 
+@pytest.fixture
+def review_repo(db_session: AsyncSession) -> ReviewRepository:
+    """Review repository bound to the test session."""
+    return ReviewRepository(db_session)
+
+
+@pytest.fixture
+def star_repo(db_session: AsyncSession) -> StarRepository:
+    """Star repository bound to the test session."""
+    return StarRepository(db_session)
+
+
 class TestReviewRepository:
     """Tests for ReviewRepository."""
 
     @pytest.mark.asyncio
     async def test_get_reviews_sort_recent(
         self,
-        db_session: AsyncSession,
+        review_repo: ReviewRepository,
         test_agent: Agent,
         test_review: Review,  # noqa: ARG002
     ) -> None:
         """Test getting reviews sorted by recent."""
-        repo = ReviewRepository(db_session)
-        reviews = await repo.get_reviews_for_agent(test_agent.id, limit=20, offset=0, sort="recent")
+        reviews = await review_repo.get_reviews_for_agent(
+            test_agent.id, limit=20, offset=0, sort="recent"
+        )
 
         assert len(reviews) == 1
         assert reviews[0].rating == 4
@@ -85,13 +99,14 @@ class TestReviewRepository:
     @pytest.mark.asyncio
     async def test_get_reviews_sort_rating(
         self,
-        db_session: AsyncSession,
+        review_repo: ReviewRepository,
         test_agent: Agent,
         test_review: Review,  # noqa: ARG002
     ) -> None:
         """Test getting reviews sorted by rating."""
-        repo = ReviewRepository(db_session)
-        reviews = await repo.get_reviews_for_agent(test_agent.id, limit=20, offset=0, sort="rating")
+        reviews = await review_repo.get_reviews_for_agent(
+            test_agent.id, limit=20, offset=0, sort="rating"
+        )
 
         assert len(reviews) == 1
         assert reviews[0].rating == 4
@@ -99,13 +114,12 @@ class TestReviewRepository:
     @pytest.mark.asyncio
     async def test_get_reviews_sort_helpful(
         self,
-        db_session: AsyncSession,
+        review_repo: ReviewRepository,
         test_agent: Agent,
         test_review: Review,  # noqa: ARG002
     ) -> None:
         """Test getting reviews sorted by helpful (default)."""
-        repo = ReviewRepository(db_session)
-        reviews = await repo.get_reviews_for_agent(
+        reviews = await review_repo.get_reviews_for_agent(
             test_agent.id, limit=20, offset=0, sort="helpful"
         )
 
@@ -115,145 +129,98 @@ class TestReviewRepository:
     @pytest.mark.asyncio
     async def test_increment_helpful(
         self,
-        db_session: AsyncSession,
+        review_repo: ReviewRepository,
         test_review: Review,
     ) -> None:
         """Test incrementing helpful count."""
-        repo = ReviewRepository(db_session)
         original_count = test_review.helpful_count
 
-        await repo.increment_helpful(test_review.id)
-        await db_session.refresh(test_review)
+        new_count = await review_repo.increment_helpful(test_review.id)
 
+        assert new_count == original_count + 1
         assert test_review.helpful_count == original_count + 1
 
     @pytest.mark.asyncio
     async def test_increment_helpful_nonexistent(
         self,
-        db_session: AsyncSession,
+        review_repo: ReviewRepository,
     ) -> None:
         """Test incrementing helpful count for non-existent review."""
-        repo = ReviewRepository(db_session)
-        # Should not raise, just do nothing
-        await repo.increment_helpful(99999)
+        assert await review_repo.increment_helpful(99999) is None
 
 
 class TestStarRepository:
     """Tests for StarRepository."""
 
     @pytest.mark.asyncio
-    async def test_add_star(
+    async def test_star_lifecycle(
         self,
-        db_session: AsyncSession,
-        test_agent: Agent,
-        test_user: User,
-    ) -> None:
-        """Test adding a star."""
-        repo = StarRepository(db_session)
-        result = await repo.add_star(test_user.id, test_agent.id)
-
-        assert result is True
-
-    @pytest.mark.asyncio
-    async def test_add_star_already_starred(
-        self,
-        db_session: AsyncSession,
-        test_agent: Agent,
-        test_user: User,
-    ) -> None:
-        """Test adding a star when already starred."""
-        repo = StarRepository(db_session)
-        await repo.add_star(test_user.id, test_agent.id)
-        result = await repo.add_star(test_user.id, test_agent.id)
-
-        assert result is False
-
-    @pytest.mark.asyncio
-    async def test_remove_star(
-        self,
-        db_session: AsyncSession,
-        test_agent: Agent,
-        test_user: User,
-    ) -> None:
-        """Test removing a star."""
-        repo = StarRepository(db_session)
-        await repo.add_star(test_user.id, test_agent.id)
-        result = await repo.remove_star(test_user.id, test_agent.id)
-
-        assert result is True
-
-    @pytest.mark.asyncio
-    async def test_remove_star_not_starred(
-        self,
-        db_session: AsyncSession,
+        star_repo: StarRepository,
         test_agent: Agent,
         test_user: User,
+        test_author: User,
     ) -> None:
-        """Test removing a star when not starred."""
-        repo = StarRepository(db_session)
-        result = await repo.remove_star(test_user.id, test_agent.id)
+        """Test add, count, list and remove against a single fixture set."""
+        assert await star_repo.is_starred(test_user.id, test_agent.id) is False
+        assert await star_repo.remove_star(test_user.id, test_agent.id) is False
 
-        assert result is False
-
-    @pytest.mark.asyncio
-    async def test_is_starred(
-        self,
-        db_session: AsyncSession,
-        test_agent: Agent,
-        test_user: User,
-    ) -> None:
-        """Test checking if starred."""
-        repo = StarRepository(db_session)
+        assert await star_repo.add_star(test_user.id, test_agent.id) is True
+        assert await star_repo.add_star(test_user.id, test_agent.id) is False
+        assert await star_repo.is_starred(test_user.id, test_agent.id) is True
 
-        assert await repo.is_starred(test_user.id, test_agent.id) is False
+        await star_repo.add_star(test_author.id, test_agent.id)
+        assert await star_repo.count_stars(test_agent.id) == 2
 
-        await repo.add_star(test_user.id, test_agent.id)
+        agents = await star_repo.get_starred_agents(test_user.id)
+        assert len(agents) == 1
+        assert agents[0].id == test_agent.id
 
-        assert await repo.is_starred(test_user.id, test_agent.id) is True
+        assert await star_repo.remove_star(test_user.id, test_agent.id) is True
+        assert await star_repo.is_starred(test_user.id, test_agent.id) is False
+        assert await star_repo.count_stars(test_agent.id) == 1
 
     @pytest.mark.asyncio
-    async def test_count_stars(
+    async def test_star_toggles_issue_one_statement_each(
         self,
-        db_session: AsyncSession,
+        star_repo: StarRepository,
         test_agent: Agent,
         test_user: User,
-        test_author: User,
+        query_counter: list[str],
     ) -> None:
-        """Test counting stars."""
-        repo = StarRepository(db_session)
-        await repo.add_star(test_user.id, test_agent.id)
-        await repo.add_star(test_author.id, test_agent.id)
-
-        count = await repo.count_stars(test_agent.id)
+        """Test add/remove star do not pre-check with a separate SELECT."""
+        assert await star_repo.add_star(test_user.id, test_agent.id) is True
+        assert await star_repo.add_star(test_user.id, test_agent.id) is False
+        assert await star_repo.remove_star(test_user.id, test_agent.id) is True
 
-        assert count == 2
+        assert len(query_counter) == 3
 
     @pytest.mark.asyncio
-    async def test_get_starred_agents(
+    async def test_get_starred_agents_preloads_author(
         self,
         db_session: AsyncSession,
+        star_repo: StarRepository,
         test_agent: Agent,
         test_user: User,
+        query_counter: list[str],
     ) -> None:
-        """Test getting starred agents for a user."""
-        repo = StarRepository(db_session)
-        await repo.add_star(test_user.id, test_agent.id)
+        """Test starred agents come back with authors loaded, without lazy loads."""
+        await star_repo.add_star(test_user.id, test_agent.id)
+        db_session.expunge_all()
+        query_counter.clear()
 
-        agents = await repo.get_starred_agents(test_user.id)
+        agents = await star_repo.get_starred_agents(test_user.id)
 
-        assert len(agents) == 1
-        assert agents[0].id == test_agent.id
+        assert [a.author.username for a in agents] == ["repoauthor"]
+        assert len(query_counter) == 2  # agents + selectin-loaded authors
 
     @pytest.mark.asyncio
     async def test_get_starred_agents_empty(
         self,
-        db_session: AsyncSession,
+        star_repo: StarRepository,
         test_user: User,
     ) -> None:
         """Test getting starred agents when none starred."""
-        repo = StarRepository(db_session)
-
-        agents = await repo.get_starred_agents(test_user.id)
+        agents = await star_repo.get_starred_agents(test_user.id)
 
         assert len(agents) == 0
 
@@ -261,24 +228,23 @@ class TestStarRepository:
     async def test_update_agent_star_count(
         self,
         db_session: AsyncSession,
+        star_repo: StarRepository,
         test_agent: Agent,
         test_user: User,
     ) -> None:
         """Test updating agent star count."""
-        repo = StarRepository(db_session)
-        await repo.add_star(test_user.id, test_agent.id)
+        await star_repo.add_star(test_user.id, test_agent.id)
 
-        await repo.update_agent_star_count(test_agent.id)
-        await db_session.refresh(test_agent)
+        await star_repo.update_agent_star_count(test_agent.id)
+        stars = await db_session.scalar(select(Agent.stars).where(Agent.id == test_agent.id))
 
-        assert test_agent.stars == 1
+        assert stars == 1
 
     @pytest.mark.asyncio
     async def test_update_agent_star_count_nonexistent(
         self,
-        db_session: AsyncSession,
+        star_repo: StarRepository,
     ) -> None:
         """Test updating star count for non-existent agent."""
-        repo = StarRepository(db_session)
         # Should not raise, just do nothing
-        await repo.update_agent_star_count(99999)
+        await star_repo.update_agent_star_count(99999)
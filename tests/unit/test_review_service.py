@@ -1,13 +1,18 @@
 """Unit tests for review service."""
 
+from collections.abc import Awaitable, Callable, Iterator
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from typing import cast
+from unittest.mock import MagicMock
 
 import pytest
 
 from agent_marketplace_api.models.agent import Agent
 from agent_marketplace_api.models.review import Review
 from agent_marketplace_api.models.user import User
+from agent_marketplace_api.repositories.agent_repo import AgentRepository
+from agent_marketplace_api.repositories.review_repo import ReviewRepository, StarRepository
 from agent_marketplace_api.schemas.review import ReviewCreate, ReviewUpdate
 from agent_marketplace_api.services.review_service import (
     AgentNotFoundError,
@@ -19,26 +24,44 @@ from agent_marketplace_api.services.review_service import (
     ReviewService,
 )
 
+# Request payloads are read-only to the service, so tests share one instance each
+_CREATE_WITH_COMMENT = ReviewCreate(rating=5, comment="Great agent!")
+_CREATE_RATING_ONLY = ReviewCreate(rating=5)
+_UPDATE_WITH_COMMENT = ReviewUpdate(rating=4, comment="Updated comment")
+_UPDATE_RATING_ONLY = ReviewUpdate(rating=4)
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def mock_review_repo() -> MagicMock:
-    """Create mock review repository."""
-    return MagicMock()
+    """Create mock review repository with AsyncMock methods pre-wired from its spec."""
+    return MagicMock(spec=ReviewRepository)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_agent_repo() -> MagicMock:
-    """Create mock agent repository."""
-    return MagicMock()
+    """Create mock agent repository with AsyncMock methods pre-wired from its spec."""
+    return MagicMock(spec=AgentRepository)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_star_repo() -> MagicMock:
-    """Create mock star repository."""
-    return MagicMock()
+    """Create mock star repository with AsyncMock methods pre-wired from its spec."""
+    return MagicMock(spec=StarRepository)
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def _reset_repo_mocks(
+    mock_review_repo: MagicMock,
+    mock_agent_repo: MagicMock,
+    mock_star_repo: MagicMock,
+) -> Iterator[None]:
+    """Clear calls and configured results on the shared repo mocks after each test."""
+    yield
+    for repo in (mock_review_repo, mock_agent_repo, mock_star_repo):
+        repo.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(scope="module")
 def review_service(
     mock_review_repo: MagicMock,
     mock_agent_repo: MagicMock,
@@ -50,37 +73,42 @@ def review_service(
 
 @pytest.fixture
 def mock_user() -> User:
-    """Create mock user."""
-    user = MagicMock(spec=User)
-    user.id = 1
-    user.username = "testuser"
-    user.avatar_url = "https://example.com/avatar.png"
-    return user
+    """Create a stand-in user; the service only reads attributes from it."""
+    return cast(
+        User,
+        SimpleNamespace(id=1, username="testuser", avatar_url="https://example.com/avatar.png"),
+    )
 
 
 @pytest.fixture
 def mock_agent() -> Agent:
-    """Create mock agent."""
-    agent = MagicMock(spec=Agent)
-    agent.id = 1
-    agent.slug = "test-agent"
-    agent.author_id = 2  # Different from test user
-    agent.rating = Decimal("0.00")
-    return agent
+    """Create a stand-in agent."""
+    return cast(
+        Agent,
+        SimpleNamespace(
+            id=1,
+            slug="test-agent",
+            author_id=2,  # Different from test user
+            rating=Decimal("0.00"),
+        ),
+    )
 
 
 @pytest.fixture
 def mock_review(mock_user: User, mock_agent: Agent) -> Review:
-    """Create mock review."""
-    review = MagicMock(spec=Review)
-    review.id = 1
-    review.agent_id = mock_agent.id
-    review.user_id = mock_user.id
-    review.user = mock_user
-    review.rating = 5
-    review.comment = "Great agent!"
-    review.helpful_count = 0
-    return review
+    """Create a stand-in review."""
+    return cast(
+        Review,
+        SimpleNamespace(
+            id=1,
+            agent_id=mock_agent.id,
+            user_id=mock_user.id,
+            user=mock_user,
+            rating=5,
+            comment="Great agent!",
+            helpful_count=0,
+        ),
+    )
 
 
 class TestGetReviews:
@@ -96,10 +124,10 @@ class TestGetReviews:
         mock_review: Review,
     ) -> None:
         """Test successful review listing."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_review_repo.get_reviews_for_agent = AsyncMock(return_value=[mock_review])
-        mock_review_repo.count_for_agent = AsyncMock(return_value=1)
-        mock_review_repo.get_average_rating = AsyncMock(return_value=5.0)
+        mock_agent_repo.find_by_slug.return_value = mock_agent
+        mock_review_repo.get_reviews_for_agent.return_value = [mock_review]
+        mock_review_repo.count_for_agent.return_value = 1
+        mock_review_repo.get_average_rating.return_value = 5.0
 
         result = await review_service.get_reviews("test-agent", limit=20, offset=0)
 
@@ -107,18 +135,7 @@ class TestGetReviews:
         assert result.total == 1
         assert result.average_rating == 5.0
 
-    @pytest.mark.asyncio
-    async def test_get_reviews_agent_not_found(
-        self,
-        review_service: ReviewService,
-        mock_agent_repo: MagicMock,
-    ) -> None:
-        """Test get_reviews with non-existent agent."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=None)
-
-        with pytest.raises(AgentNotFoundError):
-            await review_service.get_reviews("non-existent")
-
+    @pytest.mark.parametrize("sort", ["recent", "rating", "helpful"])
     @pytest.mark.asyncio
     async def test_get_reviews_with_sorting(
         self,
@@ -126,17 +143,18 @@ class TestGetReviews:
         mock_review_repo: MagicMock,
         mock_agent_repo: MagicMock,
         mock_agent: Agent,
+        sort: str,
     ) -> None:
-        """Test get_reviews with different sort options."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_review_repo.get_reviews_for_agent = AsyncMock(return_value=[])
-        mock_review_repo.count_for_agent = AsyncMock(return_value=0)
-        mock_review_repo.get_average_rating = AsyncMock(return_value=0.0)
+        """Test get_reviews passes each sort option through to the repository."""
+        mock_agent_repo.find_by_slug.return_value = mock_agent
+        mock_review_repo.get_reviews_for_agent.return_value = []
+        mock_review_repo.count_for_agent.return_value = 0
+        mock_review_repo.get_average_rating.return_value = 0.0
 
-        await review_service.get_reviews("test-agent", sort="recent")
+        await review_service.get_reviews("test-agent", sort=sort)
 
         mock_review_repo.get_reviews_for_agent.assert_called_with(
-            mock_agent.id, limit=20, offset=0, sort="recent"
+            mock_agent.id, limit=20, offset=0, sort=sort
         )
 
 
@@ -154,33 +172,18 @@ class TestCreateReview:
         mock_review: Review,
     ) -> None:
         """Test successful review creation."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_review_repo.get_by_agent_and_user = AsyncMock(return_value=None)
-        mock_review_repo.create = AsyncMock(return_value=mock_review)
-        mock_review_repo.get_with_user = AsyncMock(return_value=mock_review)
-        mock_review_repo.get_average_rating = AsyncMock(return_value=5.0)
-        mock_agent_repo.update = AsyncMock(return_value=mock_agent)
+        mock_agent_repo.find_by_slug.return_value = mock_agent
+        mock_review_repo.get_by_agent_and_user.return_value = None
+        mock_review_repo.create.return_value = mock_review
+        mock_review_repo.get_with_user.return_value = mock_review
+        mock_review_repo.get_average_rating.return_value = 5.0
+        mock_agent_repo.update.return_value = mock_agent
 
-        data = ReviewCreate(rating=5, comment="Great agent!")
-        result = await review_service.create_review("test-agent", data, mock_user)
+        result = await review_service.create_review("test-agent", _CREATE_WITH_COMMENT, mock_user)
 
         assert result == mock_review
         mock_review_repo.create.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_create_review_agent_not_found(
-        self,
-        review_service: ReviewService,
-        mock_agent_repo: MagicMock,
-        mock_user: User,
-    ) -> None:
-        """Test create_review with non-existent agent."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=None)
-
-        data = ReviewCreate(rating=5)
-        with pytest.raises(AgentNotFoundError):
-            await review_service.create_review("non-existent", data, mock_user)
-
     @pytest.mark.asyncio
     async def test_create_review_already_reviewed(
         self,
@@ -192,12 +195,11 @@ class TestCreateReview:
         mock_review: Review,
     ) -> None:
         """Test create_review when already reviewed."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_review_repo.get_by_agent_and_user = AsyncMock(return_value=mock_review)
+        mock_agent_repo.find_by_slug.return_value = mock_agent
+        mock_review_repo.get_by_agent_and_user.return_value = mock_review
 
-        data = ReviewCreate(rating=5)
         with pytest.raises(ReviewAlreadyExistsError):
-            await review_service.create_review("test-agent", data, mock_user)
+            await review_service.create_review("test-agent", _CREATE_RATING_ONLY, mock_user)
 
 
 class TestUpdateReview:
@@ -214,48 +216,16 @@ class TestUpdateReview:
         mock_agent: Agent,
     ) -> None:
         """Test successful review update."""
-        mock_review_repo.get_with_user = AsyncMock(return_value=mock_review)
-        mock_review_repo.update = AsyncMock(return_value=mock_review)
-        mock_agent_repo.get = AsyncMock(return_value=mock_agent)
-        mock_review_repo.get_average_rating = AsyncMock(return_value=4.0)
-        mock_agent_repo.update = AsyncMock(return_value=mock_agent)
+        mock_review_repo.get_with_user.return_value = mock_review
+        mock_review_repo.update.return_value = mock_review
+        mock_agent_repo.get.return_value = mock_agent
+        mock_review_repo.get_average_rating.return_value = 4.0
+        mock_agent_repo.update.return_value = mock_agent
 
-        data = ReviewUpdate(rating=4, comment="Updated comment")
-        result = await review_service.update_review(1, data, mock_user)
+        result = await review_service.update_review(1, _UPDATE_WITH_COMMENT, mock_user)
 
         assert result == mock_review
 
-    @pytest.mark.asyncio
-    async def test_update_review_not_found(
-        self,
-        review_service: ReviewService,
-        mock_review_repo: MagicMock,
-        mock_user: User,
-    ) -> None:
-        """Test update_review with non-existent review."""
-        mock_review_repo.get_with_user = AsyncMock(return_value=None)
-
-        data = ReviewUpdate(rating=4)
-        with pytest.raises(ReviewNotFoundError):
-            await review_service.update_review(999, data, mock_user)
-
-    @pytest.mark.asyncio
-    async def test_update_review_not_owner(
-        self,
-        review_service: ReviewService,
-        mock_review_repo: MagicMock,
-        mock_review: Review,
-    ) -> None:
-        """Test update_review by non-owner."""
-        mock_review_repo.get_with_user = AsyncMock(return_value=mock_review)
-
-        other_user = MagicMock(spec=User)
-        other_user.id = 999
-
-        data = ReviewUpdate(rating=4)
-        with pytest.raises(NotReviewOwnerError):
-            await review_service.update_review(1, data, other_user)
-
 
 class TestDeleteReview:
     """Tests for delete_review method."""
@@ -271,45 +241,15 @@ class TestDeleteReview:
         mock_agent: Agent,
     ) -> None:
         """Test successful review deletion."""
-        mock_review_repo.get = AsyncMock(return_value=mock_review)
-        mock_review_repo.delete = AsyncMock()
-        mock_agent_repo.get = AsyncMock(return_value=mock_agent)
-        mock_review_repo.get_average_rating = AsyncMock(return_value=0.0)
-        mock_agent_repo.update = AsyncMock(return_value=mock_agent)
+        mock_review_repo.get.return_value = mock_review
+        mock_agent_repo.get.return_value = mock_agent
+        mock_review_repo.get_average_rating.return_value = 0.0
+        mock_agent_repo.update.return_value = mock_agent
 
         await review_service.delete_review(1, mock_user)
 
         mock_review_repo.delete.assert_called_once_with(mock_review)
 
-    @pytest.mark.asyncio
-    async def test_delete_review_not_found(
-        self,
-        review_service: ReviewService,
-        mock_review_repo: MagicMock,
-        mock_user: User,
-    ) -> None:
-        """Test delete_review with non-existent review."""
-        mock_review_repo.get = AsyncMock(return_value=None)
-
-        with pytest.raises(ReviewNotFoundError):
-            await review_service.delete_review(999, mock_user)
-
-    @pytest.mark.asyncio
-    async def test_delete_review_not_owner(
-        self,
-        review_service: ReviewService,
-        mock_review_repo: MagicMock,
-        mock_review: Review,
-    ) -> None:
-        """Test delete_review by non-owner."""
-        mock_review_repo.get = AsyncMock(return_value=mock_review)
-
-        other_user = MagicMock(spec=User)
-        other_user.id = 999
-
-        with pytest.raises(NotReviewOwnerError):
-            await review_service.delete_review(1, other_user)
-
 
 class TestMarkHelpful:
     """Tests for mark_helpful method."""
@@ -323,11 +263,9 @@ class TestMarkHelpful:
     ) -> None:
         """Test successful mark as helpful."""
         # Different user marking as helpful
-        other_user = MagicMock(spec=User)
-        other_user.id = 999
+        other_user = cast(User, SimpleNamespace(id=999))
 
-        mock_review_repo.get = AsyncMock(return_value=mock_review)
-        mock_review_repo.increment_helpful = AsyncMock()
+        mock_review_repo.get.return_value = mock_review
 
         await review_service.mark_helpful(1, other_user)
 
@@ -342,27 +280,13 @@ class TestMarkHelpful:
         mock_review: Review,
     ) -> None:
         """Test marking own review as helpful (should be ignored)."""
-        mock_review_repo.get = AsyncMock(return_value=mock_review)
-        mock_review_repo.increment_helpful = AsyncMock()
+        mock_review_repo.get.return_value = mock_review
 
         await review_service.mark_helpful(1, mock_user)
 
         # Should not increment for own review
         mock_review_repo.increment_helpful.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_mark_helpful_not_found(
-        self,
-        review_service: ReviewService,
-        mock_review_repo: MagicMock,
-        mock_user: User,
-    ) -> None:
-        """Test mark_helpful with non-existent review."""
-        mock_review_repo.get = AsyncMock(return_value=None)
-
-        with pytest.raises(ReviewNotFoundError):
-            await review_service.mark_helpful(999, mock_user)
-
 
 class TestStarAgent:
     """Tests for star_agent method."""
@@ -377,28 +301,14 @@ class TestStarAgent:
         mock_user: User,
     ) -> None:
         """Test successful star."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_star_repo.add_star = AsyncMock(return_value=True)
-        mock_star_repo.update_agent_star_count = AsyncMock()
+        mock_agent_repo.find_by_slug.return_value = mock_agent
+        mock_star_repo.add_star.return_value = True
 
         await review_service.star_agent("test-agent", mock_user)
 
         mock_star_repo.add_star.assert_called_once_with(mock_user.id, mock_agent.id)
         mock_star_repo.update_agent_star_count.assert_called_once_with(mock_agent.id)
 
-    @pytest.mark.asyncio
-    async def test_star_agent_not_found(
-        self,
-        review_service: ReviewService,
-        mock_agent_repo: MagicMock,
-        mock_user: User,
-    ) -> None:
-        """Test star_agent with non-existent agent."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=None)
-
-        with pytest.raises(AgentNotFoundError):
-            await review_service.star_agent("non-existent", mock_user)
-
     @pytest.mark.asyncio
     async def test_star_agent_already_starred(
         self,
@@ -409,8 +319,8 @@ class TestStarAgent:
         mock_user: User,
     ) -> None:
         """Test star_agent when already starred."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_star_repo.add_star = AsyncMock(return_value=False)
+        mock_agent_repo.find_by_slug.return_value = mock_agent
+        mock_star_repo.add_star.return_value = False
 
         with pytest.raises(AlreadyStarredError):
             await review_service.star_agent("test-agent", mock_user)
@@ -429,28 +339,14 @@ class TestUnstarAgent:
         mock_user: User,
     ) -> None:
         """Test successful unstar."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_star_repo.remove_star = AsyncMock(return_value=True)
-        mock_star_repo.update_agent_star_count = AsyncMock()
+        mock_agent_repo.find_by_slug.return_value = mock_agent
+        mock_star_repo.remove_star.return_value = True
 
         await review_service.unstar_agent("test-agent", mock_user)
 
         mock_star_repo.remove_star.assert_called_once_with(mock_user.id, mock_agent.id)
         mock_star_repo.update_agent_star_count.assert_called_once_with(mock_agent.id)
 
-    @pytest.mark.asyncio
-    async def test_unstar_agent_not_found(
-        self,
-        review_service: ReviewService,
-        mock_agent_repo: MagicMock,
-        mock_user: User,
-    ) -> None:
-        """Test unstar_agent with non-existent agent."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=None)
-
-        with pytest.raises(AgentNotFoundError):
-            await review_service.unstar_agent("non-existent", mock_user)
-
     @pytest.mark.asyncio
     async def test_unstar_agent_not_starred(
         self,
@@ -461,8 +357,8 @@ class TestUnstarAgent:
         mock_user: User,
     ) -> None:
         """Test unstar_agent when not starred."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_star_repo.remove_star = AsyncMock(return_value=False)
+        mock_agent_repo.find_by_slug.return_value = mock_agent
+        mock_star_repo.remove_star.return_value = False
 
         with pytest.raises(NotStarredError):
             await review_service.unstar_agent("test-agent", mock_user)
@@ -471,96 +367,115 @@ class TestUnstarAgent:
 class TestIsStarred:
     """Tests for is_starred method."""
 
+    @pytest.mark.parametrize("starred", [True, False])
     @pytest.mark.asyncio
-    async def test_is_starred_true(
+    async def test_is_starred(
         self,
         review_service: ReviewService,
         mock_agent_repo: MagicMock,
         mock_star_repo: MagicMock,
         mock_agent: Agent,
         mock_user: User,
+        starred: bool,
     ) -> None:
-        """Test is_starred returns True when starred."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_star_repo.is_starred = AsyncMock(return_value=True)
+        """Test is_starred returns the repository's starred state."""
+        mock_agent_repo.find_by_slug.return_value = mock_agent
+        mock_star_repo.is_starred.return_value = starred
 
         result = await review_service.is_starred("test-agent", mock_user)
 
-        assert result is True
+        assert result is starred
 
-    @pytest.mark.asyncio
-    async def test_is_starred_false(
-        self,
-        review_service: ReviewService,
-        mock_agent_repo: MagicMock,
-        mock_star_repo: MagicMock,
-        mock_agent: Agent,
-        mock_user: User,
-    ) -> None:
-        """Test is_starred returns False when not starred."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_star_repo.is_starred = AsyncMock(return_value=False)
-
-        result = await review_service.is_starred("test-agent", mock_user)
 
-        assert result is False
+class TestAgentNotFound:
+    """Tests for service methods called with an unknown agent slug."""
 
+    @pytest.mark.parametrize(
+        "call",
+        [
+            lambda service, _user: service.get_reviews("non-existent"),
+            lambda service, user: service.create_review("non-existent", _CREATE_RATING_ONLY, user),
+            lambda service, user: service.star_agent("non-existent", user),
+            lambda service, user: service.unstar_agent("non-existent", user),
+            lambda service, user: service.is_starred("non-existent", user),
+        ],
+        ids=["get_reviews", "create_review", "star_agent", "unstar_agent", "is_starred"],
+    )
     @pytest.mark.asyncio
-    async def test_is_starred_agent_not_found(
+    async def test_agent_not_found(
         self,
         review_service: ReviewService,
         mock_agent_repo: MagicMock,
         mock_user: User,
+        call: Callable[[ReviewService, User], Awaitable[object]],
     ) -> None:
-        """Test is_starred with non-existent agent."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=None)
+        """Test each agent-scoped method raises AgentNotFoundError."""
+        mock_agent_repo.find_by_slug.return_value = None
 
         with pytest.raises(AgentNotFoundError):
-            await review_service.is_starred("non-existent", mock_user)
-
-
-class TestGetReviewsSort:
-    """Tests for get_reviews method with different sort options."""
-
+            await call(review_service, mock_user)
+
+
+class TestReviewNotFound:
+    """Tests for service methods called with an unknown review ID."""
+
+    @pytest.mark.parametrize(
+        ("getter", "call"),
+        [
+            (
+                "get_with_user",
+                lambda service, user: service.update_review(999, _UPDATE_RATING_ONLY, user),
+            ),
+            ("get", lambda service, user: service.delete_review(999, user)),
+            ("get", lambda service, user: service.mark_helpful(999, user)),
+        ],
+        ids=["update_review", "delete_review", "mark_helpful"],
+    )
     @pytest.mark.asyncio
-    async def test_get_reviews_sort_by_rating(
+    async def test_review_not_found(
         self,
         review_service: ReviewService,
         mock_review_repo: MagicMock,
-        mock_agent_repo: MagicMock,
-        mock_agent: Agent,
+        mock_user: User,
+        getter: str,
+        call: Callable[[ReviewService, User], Awaitable[object]],
     ) -> None:
-        """Test get_reviews with rating sort."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_review_repo.get_reviews_for_agent = AsyncMock(return_value=[])
-        mock_review_repo.count_for_agent = AsyncMock(return_value=0)
-        mock_review_repo.get_average_rating = AsyncMock(return_value=0.0)
-
-        await review_service.get_reviews("test-agent", sort="rating")
-
-        mock_review_repo.get_reviews_for_agent.assert_called_with(
-            mock_agent.id, limit=20, offset=0, sort="rating"
-        )
+        """Test each review-scoped method raises ReviewNotFoundError."""
+        getattr(mock_review_repo, getter).return_value = None
 
+        with pytest.raises(ReviewNotFoundError):
+            await call(review_service, mock_user)
+
+
+class TestNotReviewOwner:
+    """Tests for review changes attempted by someone other than the author."""
+
+    @pytest.mark.parametrize(
+        ("getter", "call"),
+        [
+            (
+                "get_with_user",
+                lambda service, user: service.update_review(1, _UPDATE_RATING_ONLY, user),
+            ),
+            ("get", lambda service, user: service.delete_review(1, user)),
+        ],
+        ids=["update_review", "delete_review"],
+    )
     @pytest.mark.asyncio
-    async def test_get_reviews_sort_by_helpful(
+    async def test_not_review_owner(
         self,
         review_service: ReviewService,
         mock_review_repo: MagicMock,
-        mock_agent_repo: MagicMock,
-        mock_agent: Agent,
+        mock_review: Review,
+        getter: str,
+        call: Callable[[ReviewService, User], Awaitable[object]],
     ) -> None:
-        """Test get_reviews with helpful sort (default)."""
-        mock_agent_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_review_repo.get_reviews_for_agent = AsyncMock(return_value=[])
-        mock_review_repo.count_for_agent = AsyncMock(return_value=0)
-        mock_review_repo.get_average_rating = AsyncMock(return_value=0.0)
-
-        await review_service.get_reviews("test-agent", sort="helpful")
+        """Test update and delete reject a user who did not write the review."""
+        getattr(mock_review_repo, getter).return_value = mock_review
+        other_user = cast(User, SimpleNamespace(id=999))
 
-        mock_review_repo.get_reviews_for_agent.assert_called_with(
-            mock_agent.id, limit=20, offset=0, sort="helpful"
-        )
+        with pytest.raises(NotReviewOwnerError):
+            await call(review_service, other_user)
 
 
 class TestGetReviewServiceFactory:
@@ -26,6 +26,23 @@ from agent_marketplace_api.schemas.agent import AgentSummary
 from agent_marketplace_api.schemas.review import ReviewListResponse
 from agent_marketplace_api.schemas.user import UserSummary
 
+_NOW = datetime(2024, 1, 1)
+_RATING = Decimal("4.50")
+_ZERO_RATING = Decimal("0.00")
+_SCORE = Decimal("0.95")
+_USER_RESPONSE_DATA = {
+    "id": 1,
+    "github_id": 12345,
+    "username": "testuser",
+    "email": "test@example.com",
+    "avatar_url": None,
+    "bio": None,
+    "reputation": 100,
+    "is_active": True,
+    "created_at": _NOW,
+    "updated_at": _NOW,
+}
+
 
 class TestUserSchemas:
     """Tests for User schemas."""
@@ -37,15 +54,16 @@ class TestUserSchemas:
         assert user.email == "test@example.com"
         assert user.github_id == 12345
 
-    def test_user_create_invalid_email(self) -> None:
-        """Test user creation with invalid email."""
-        with pytest.raises(ValidationError):
-            UserCreate(username="testuser", email="invalid-email", github_id=12345)
-
-    def test_user_create_empty_username(self) -> None:
-        """Test user creation with empty username."""
-        with pytest.raises(ValidationError):
-            UserCreate(username="", email="test@example.com", github_id=12345)
+    @pytest.mark.parametrize(
+        ("field", "value"),
+        [("email", "invalid-email"), ("username", "")],
+        ids=["invalid_email", "empty_username"],
+    )
+    def test_user_create_invalid(self, field: str, value: str) -> None:
+        """Test user creation rejects an invalid field."""
+        data = {"username": "testuser", "email": "test@example.com", "github_id": 12345}
+        with pytest.raises(ValidationError, match=field):
+            UserCreate(**{**data, field: value})
 
     def test_user_update_optional_fields(self) -> None:
         """Test user update with optional fields."""
@@ -55,20 +73,7 @@ class TestUserSchemas:
 
     def test_user_response_from_attributes(self) -> None:
         """Test UserResponse from_attributes config."""
-        now = datetime.utcnow()
-        data = {
-            "id": 1,
-            "github_id": 12345,
-            "username": "testuser",
-            "email": "test@example.com",
-            "avatar_url": None,
-            "bio": None,
-            "reputation": 100,
-            "is_active": True,
-            "created_at": now,
-            "updated_at": now,
-        }
-        response = UserResponse.model_validate(data)
+        response = UserResponse.model_validate(_USER_RESPONSE_DATA)
         assert response.id == 1
         assert response.reputation == 100
 
@@ -93,35 +98,21 @@ class TestAgentSchemas:
         assert agent.name == "Test Agent"
         assert agent.version == "1.0.0"
 
-    def test_agent_create_short_name(self) -> None:
-        """Test agent creation with too short name."""
-        with pytest.raises(ValidationError):
-            AgentCreate(
-                name="AB",
-                description="A test agent for testing",
-                category="testing",
-                version="1.0.0",
-            )
-
-    def test_agent_create_short_description(self) -> None:
-        """Test agent creation with too short description."""
-        with pytest.raises(ValidationError):
-            AgentCreate(
-                name="Test Agent",
-                description="Short",
-                category="testing",
-                version="1.0.0",
-            )
-
-    def test_agent_create_invalid_version(self) -> None:
-        """Test agent creation with invalid version format."""
-        with pytest.raises(ValidationError):
-            AgentCreate(
-                name="Test Agent",
-                description="A test agent for testing",
-                category="testing",
-                version="v1.0",
-            )
+    @pytest.mark.parametrize(
+        ("field", "value"),
+        [("name", "AB"), ("description", "Short"), ("version", "v1.0")],
+        ids=["short_name", "short_description", "invalid_version"],
+    )
+    def test_agent_create_invalid(self, field: str, value: str) -> None:
+        """Test agent creation rejects an invalid field."""
+        data = {
+            "name": "Test Agent",
+            "description": "A test agent for testing",
+            "category": "testing",
+            "version": "1.0.0",
+        }
+        with pytest.raises(ValidationError, match=field):
+            AgentCreate(**{**data, field: value})
 
     def test_agent_update_partial(self) -> None:
         """Test agent update with partial fields."""
@@ -138,7 +129,6 @@ class TestAgentSchemas:
 
     def test_agent_version_response(self) -> None:
         """Test AgentVersionResponse schema."""
-        now = datetime.utcnow()
         response = AgentVersionResponse(
             id=1,
             version="1.0.0",
@@ -146,15 +136,14 @@ class TestAgentSchemas:
             size_bytes=1024,
             tested=True,
             security_scan_passed=True,
-            quality_score=Decimal("0.95"),
-            published_at=now,
+            quality_score=_SCORE,
+            published_at=_NOW,
         )
         assert response.version == "1.0.0"
         assert response.tested is True
 
     def test_agent_response(self) -> None:
         """Test AgentResponse schema."""
-        now = datetime.utcnow()
         response = AgentResponse(
             id=1,
             name="Test Agent",
@@ -164,19 +153,18 @@ class TestAgentSchemas:
             current_version="1.0.0",
             downloads=100,
             stars=50,
-            rating=Decimal("4.50"),
+            rating=_RATING,
             is_public=True,
             is_validated=True,
-            created_at=now,
-            updated_at=now,
+            created_at=_NOW,
+            updated_at=_NOW,
             versions=[],
         )
         assert response.slug == "test-agent"
-        assert response.rating == Decimal("4.50")
+        assert response.rating == _RATING
 
     def test_agent_summary(self) -> None:
         """Test AgentSummary schema."""
-        now = datetime.utcnow()
         summary = AgentSummary(
             id=1,
             name="Test",
@@ -186,9 +174,9 @@ class TestAgentSchemas:
             current_version="1.0.0",
             downloads=0,
             stars=0,
-            rating=Decimal("0.00"),
+            rating=_ZERO_RATING,
             is_validated=False,
-            created_at=now,
+            created_at=_NOW,
         )
         assert summary.slug == "test"
 
@@ -248,15 +236,11 @@ class TestReviewSchemas:
         assert review.rating == 5
         assert review.comment == "Excellent!"
 
-    def test_review_create_rating_too_low(self) -> None:
-        """Test review creation with rating too low."""
-        with pytest.raises(ValidationError):
-            ReviewCreate(rating=0, comment="Bad")
-
-    def test_review_create_rating_too_high(self) -> None:
-        """Test review creation with rating too high."""
-        with pytest.raises(ValidationError):
-            ReviewCreate(rating=6, comment="Great")
+    @pytest.mark.parametrize("rating", [0, 6], ids=["too_low", "too_high"])
+    def test_review_create_rating_out_of_range(self, rating: int) -> None:
+        """Test review creation with rating outside 1-5."""
+        with pytest.raises(ValidationError, match="rating"):
+            ReviewCreate(rating=rating, comment="Out of range")
 
     def test_review_create_no_comment(self) -> None:
         """Test review creation without comment."""
@@ -271,12 +255,11 @@ class TestReviewSchemas:
 
     def test_review_update_invalid_rating(self) -> None:
         """Test review update with invalid rating."""
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValidationError, match="rating"):
             ReviewUpdate(rating=10)
 
     def test_review_response(self) -> None:
         """Test ReviewResponse schema."""
-        now = datetime.utcnow()
         response = ReviewResponse(
             id=1,
             agent_id=1,
@@ -284,8 +267,8 @@ class TestReviewSchemas:
             comment="Great!",
             user=UserSummary(id=1, username="reviewer"),
             helpful_count=10,
-            created_at=now,
-            updated_at=now,
+            created_at=_NOW,
+            updated_at=_NOW,
         )
         assert response.rating == 5
         assert response.helpful_count == 10
@@ -1,94 +1,124 @@
 """Unit tests for search service."""
 
+from collections.abc import AsyncGenerator
+
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from agent_marketplace_api.models import Agent, User
-from agent_marketplace_api.services.search_service import SearchService, get_search_service
+from agent_marketplace_api.repositories import AgentRepository
+from agent_marketplace_api.schemas import AgentCreate
+from agent_marketplace_api.services.agent_service import AgentService
+from agent_marketplace_api.services.search_service import (
+    SearchService,
+    get_search_service,
+    invalidate_search_cache,
+)
+
+
+@pytest.fixture(scope="module")
+async def search_rows(
+    db_connection: AsyncConnection,
+) -> AsyncGenerator[tuple[User, User, list[Agent]], None]:
+    """Insert the module's users and agents once, rolled back after the last test.
+
+    Rows live in a SAVEPOINT on the shared connection; each test's own
+    ``db_session`` SAVEPOINT nests inside it, so tests still cannot see each
+    other's writes. Tests must not modify these rows.
+    """
+    savepoint = await db_connection.begin_nested()
+    async with AsyncSession(
+        bind=db_connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    ) as session:
+        user_result = await session.execute(
+            insert(User).returning(User, sort_by_parameter_order=True),
+            [
+                {
+                    "github_id": 60001,
+                    "username": "searchuser",
+                    "email": "searchuser@example.com",
+                    "bio": "A developer who builds agents",
+                },
+                {
+                    "github_id": 60002,
+                    "username": "codemaster",
+                    "email": "codemaster@example.com",
+                    "bio": "Code quality expert",
+                    "reputation": 100,
+                },
+            ],
+        )
+        user, user2 = user_result.scalars().all()
+
+        shared = {"author_id": user.id, "current_version": "1.0.0", "is_validated": True}
+        agent_result = await session.execute(
+            insert(Agent).returning(Agent, sort_by_parameter_order=True),
+            [
+                {
+                    **shared,
+                    "name": "Code Review Agent",
+                    "slug": "code-review-agent",
+                    "description": "An agent for reviewing code quality",
+                    "is_public": True,
+                    "downloads": 100,
+                    "stars": 50,
+                },
+                {
+                    **shared,
+                    "name": "Test Runner",
+                    "slug": "test-runner",
+                    "description": "Runs tests automatically",
+                    "is_public": True,
+                    "downloads": 50,
+                    "stars": 25,
+                },
+                {
+                    **shared,
+                    "name": "Code Formatter",
+                    "slug": "code-formatter",
+                    "description": "Formats code nicely",
+                    "is_public": True,
+                    "downloads": 200,
+                    "stars": 100,
+                },
+                {
+                    **shared,
+                    "name": "Private Agent",
+                    "slug": "private-agent",
+                    "description": "This is private code helper",
+                    "is_public": False,
+                    "downloads": 10,
+                    "stars": 5,
+                },
+            ],
+        )
+        agents = list(agent_result.scalars().all())
+        await session.commit()  # releases the session's SAVEPOINT, not the module's
 
+    yield user, user2, agents
 
-@pytest.fixture
-async def test_user(db_session: AsyncSession) -> User:
-    """Create a test user."""
-    user = User(
-        github_id=60001,
-        username="searchuser",
-        email="searchuser@example.com",
-        bio="A developer who builds agents",
-    )
-    db_session.add(user)
-    await db_session.flush()
-    return user
-
-
-@pytest.fixture
-async def test_user2(db_session: AsyncSession) -> User:
-    """Create another test user."""
-    user = User(
-        github_id=60002,
-        username="codemaster",
-        email="codemaster@example.com",
-        bio="Code quality expert",
-        reputation=100,
-    )
-    db_session.add(user)
-    await db_session.flush()
-    return user
-
-
-@pytest.fixture
-async def test_agents(db_session: AsyncSession, test_user: User) -> list[Agent]:
-    """Create test agents for search."""
-    agents = [
-        Agent(
-            name="Code Review Agent",
-            slug="code-review-agent",
-            description="An agent for reviewing code quality",
-            author_id=test_user.id,
-            current_version="1.0.0",
-            is_public=True,
-            is_validated=True,
-            downloads=100,
-            stars=50,
-        ),
-        Agent(
-            name="Test Runner",
-            slug="test-runner",
-            description="Runs tests automatically",
-            author_id=test_user.id,
-            current_version="1.0.0",
-            is_public=True,
-            is_validated=True,
-            downloads=50,
-            stars=25,
-        ),
-        Agent(
-            name="Code Formatter",
-            slug="code-formatter",
-            description="Formats code nicely",
-            author_id=test_user.id,
-            current_version="1.0.0",
-            is_public=True,
-            is_validated=True,
-            downloads=200,
-            stars=100,
-        ),
-        Agent(
-            name="Private Agent",
-            slug="private-agent",
-            description="This is private code helper",
-            author_id=test_user.id,
-            current_version="1.0.0",
-            is_public=False,
-            is_validated=True,
-            downloads=10,
-            stars=5,
-        ),
-    ]
-    for agent in agents:
-        db_session.add(agent)
-    await db_session.flush()
-    return agents
+    await savepoint.rollback()
+
+
+@pytest.fixture(scope="module")
+def test_user(search_rows: tuple[User, User, list[Agent]]) -> User:
+    """Test user that authored the search agents."""
+    return search_rows[0]
+
+
+@pytest.fixture(scope="module")
+def test_user2(search_rows: tuple[User, User, list[Agent]]) -> User:
+    """Another test user."""
+    return search_rows[1]
+
+
+@pytest.fixture(scope="module")
+def test_agents(search_rows: tuple[User, User, list[Agent]]) -> list[Agent]:
+    """Test agents for search."""
+    return search_rows[2]
 
 
 class TestSearchAgents:
@@ -149,6 +179,25 @@ class TestSearchAgents:
         assert result.limit == 1
         assert result.offset == 0
 
+    @pytest.mark.parametrize(("limit", "has_more"), [(1, True), (2, False)])
+    @pytest.mark.asyncio
+    async def test_search_agents_without_total(
+        self,
+        db_session: AsyncSession,
+        test_agents: list[Agent],  # noqa: ARG002
+        query_counter: list[str],
+        limit: int,
+        has_more: bool,
+    ) -> None:
+        """Test has_more comes from an extra row when the count is skipped."""
+        service = SearchService(db_session)
+        result = await service.search_agents("code", limit=limit, include_total=False)
+
+        assert result.total is None
+        assert len(result.items) == limit
+        assert result.has_more is has_more
+        assert not any("count(" in q.lower() for q in query_counter)
+
     @pytest.mark.asyncio
     async def test_search_agents_sort_by_downloads(
         self,
@@ -253,6 +302,21 @@ class TestGlobalSearch:
         assert result.total >= 1
         # Should have some results
 
+    @pytest.mark.asyncio
+    async def test_global_search_skips_count_query(
+        self,
+        db_session: AsyncSession,
+        test_agents: list[Agent],  # noqa: ARG002
+        query_counter: list[str],
+    ) -> None:
+        """Test global search runs one query per kind plus the author preload."""
+        service = SearchService(db_session)
+        result = await service.global_search("code")
+
+        assert [a.name for a in result.agents] == ["Code Formatter", "Code Review Agent"]
+        assert len(query_counter) == 3  # agents + selectin-loaded authors + users
+        assert not any("count(" in q.lower() for q in query_counter)
+
     @pytest.mark.asyncio
     async def test_global_search_agents_only(
         self,
@@ -266,6 +330,30 @@ class TestGlobalSearch:
         assert len(result.users) == 0
         assert len(result.agents) >= 1
 
+    @pytest.mark.parametrize(
+        ("search_type", "skipped_filter", "statements"),
+        [
+            ("agents", "WHERE users.is_active", 2),  # agents + selectin-loaded authors
+            ("users", "WHERE agents.is_public", 1),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_global_search_skips_filtered_branch(
+        self,
+        db_session: AsyncSession,
+        test_agents: list[Agent],  # noqa: ARG002
+        query_counter: list[str],
+        search_type: str,
+        skipped_filter: str,
+        statements: int,
+    ) -> None:
+        """Test the branch excluded by search_type never reaches the database."""
+        service = SearchService(db_session)
+        await service.global_search("code", search_type=search_type)
+
+        assert len(query_counter) == statements
+        assert not any(skipped_filter in q for q in query_counter)
+
     @pytest.mark.asyncio
     async def test_global_search_users_only(
         self,
@@ -291,10 +379,10 @@ class TestGetSuggestions:
     ) -> None:
         """Test getting suggestions with prefix match."""
         service = SearchService(db_session)
-        result = await service.get_suggestions("Code")
+        result = await service.get_suggestions("code")
 
-        assert len(result) >= 1
-        # Should suggest agent names starting with "Code"
+        # Prefix matching is case-insensitive, most downloaded first
+        assert result[:2] == ["Code Formatter", "Code Review Agent"]
 
     @pytest.mark.asyncio
     async def test_get_suggestions_partial_match(
@@ -306,8 +394,20 @@ class TestGetSuggestions:
         service = SearchService(db_session)
         result = await service.get_suggestions("Review")
 
-        # Should include partial matches if not enough prefix matches
-        assert isinstance(result, list)
+        # No prefix match, so the partial match fills in
+        assert result == ["Code Review Agent"]
+
+    @pytest.mark.asyncio
+    async def test_get_suggestions_partial_excludes_prefix_matches(
+        self,
+        db_session: AsyncSession,
+        test_agents: list[Agent],  # noqa: ARG002
+    ) -> None:
+        """Test names found by prefix are not repeated by the partial match."""
+        service = SearchService(db_session)
+        result = await service.get_suggestions("Co")
+
+        assert result == ["Code Formatter", "Code Review Agent"]
 
     @pytest.mark.asyncio
     async def test_get_suggestions_limited(
@@ -321,6 +421,68 @@ class TestGetSuggestions:
 
         assert len(result) <= 2
 
+    @pytest.mark.asyncio
+    async def test_get_suggestions_cached_until_invalidated(
+        self,
+        db_session: AsyncSession,
+        test_agents: list[Agent],
+        query_counter: list[str],
+    ) -> None:
+        """Test repeated suggestions are served from cache until agents change."""
+        service = SearchService(db_session)
+        first = await service.get_suggestions("Code")
+        queries = len(query_counter)
+
+        assert await service.get_suggestions("code") == first
+        assert len(query_counter) == queries
+
+        db_session.add(
+            Agent(
+                name="Code Auditor",
+                slug="code-auditor",
+                description="Audits code",
+                author_id=test_agents[0].author_id,
+                current_version="1.0.0",
+                is_public=True,
+            )
+        )
+        await db_session.flush()
+        invalidate_search_cache()
+        query_counter.clear()
+
+        assert "Code Auditor" in await service.get_suggestions("Code")
+        assert query_counter
+
+    @pytest.mark.asyncio
+    async def test_get_suggestions_refresh_after_committed_create(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_agents: list[Agent],  # noqa: ARG002
+    ) -> None:
+        """Test suggestions cached before a create are dropped when it commits, not before."""
+        service = SearchService(db_session)
+        assert await service.get_suggestions("Fresh") == []
+
+        agent_service = AgentService(AgentRepository(db_session))
+        await agent_service.create_agent(
+            AgentCreate(
+                name="Fresh Agent",
+                description="Newly created agent",
+                category="testing",
+                version="1.0.0",
+            ),
+            test_user,
+            "agents/fresh-agent/1.0.0.zip",
+        )
+
+        # Not yet committed: another request could still cache the old result
+        assert await service.get_suggestions("Fresh") == []
+
+        await db_session.commit()
+
+        assert await service.get_suggestions("Fresh") == ["Fresh Agent"]
+
 
 class TestGetSearchServiceFactory:
     """Tests for get_search_service factory."""
@@ -16,6 +16,24 @@ from agent_marketplace_api.security import (
 )
 
 
+@pytest.fixture(scope="module")
+def secret_hash() -> str:
+    """Hash of "secret123", computed once for the verification tests."""
+    return hash_password("secret123")
+
+
+@pytest.fixture(scope="module")
+def access_token() -> str:
+    """Access token for user 123, signed once for the module."""
+    return create_access_token({"sub": "123", "username": "testuser"})
+
+
+@pytest.fixture(scope="module")
+def refresh_token() -> str:
+    """Refresh token for user 123, signed once for the module."""
+    return create_refresh_token({"sub": "123", "username": "testuser"})
+
+
 class TestPasswordHashing:
     """Tests for password hashing functions."""
 
@@ -27,19 +45,13 @@ class TestPasswordHashing:
         assert hashed != password
         assert hashed.startswith("$2b$")  # bcrypt prefix
 
-    def test_verify_password_correct(self) -> None:
+    def test_verify_password_correct(self, secret_hash: str) -> None:
         """Test that verify_password returns True for correct password."""
-        password = "secret123"
-        hashed = hash_password(password)
-
-        assert verify_password(password, hashed) is True
+        assert verify_password("secret123", secret_hash) is True
 
-    def test_verify_password_incorrect(self) -> None:
+    def test_verify_password_incorrect(self, secret_hash: str) -> None:
         """Test that verify_password returns False for incorrect password."""
-        password = "secret123"
-        hashed = hash_password(password)
-
-        assert verify_password("wrongpassword", hashed) is False
+        assert verify_password("wrongpassword", secret_hash) is False
 
     def test_same_password_different_hashes(self) -> None:
         """Test that same password produces different hashes (due to salt)."""
@@ -55,20 +67,14 @@ class TestPasswordHashing:
 class TestAccessToken:
     """Tests for access token creation and verification."""
 
-    def test_create_access_token(self) -> None:
+    def test_create_access_token(self, access_token: str) -> None:
         """Test that create_access_token returns a valid JWT."""
-        data = {"sub": "123", "username": "testuser"}
-        token = create_access_token(data)
-
-        assert isinstance(token, str)
-        assert len(token) > 0
+        assert isinstance(access_token, str)
+        assert len(access_token) > 0
 
-    def test_verify_access_token(self) -> None:
+    def test_verify_access_token(self, access_token: str) -> None:
         """Test that verify_token correctly decodes access token."""
-        data = {"sub": "123", "username": "testuser"}
-        token = create_access_token(data)
-
-        payload = verify_token(token)
+        payload = verify_token(access_token)
 
         assert payload["sub"] == "123"
         assert payload["username"] == "testuser"
@@ -95,11 +101,8 @@ class TestAccessToken:
         with pytest.raises(InvalidTokenError, match="Invalid token"):
             verify_token("invalid.token.here")
 
-    def test_verify_access_token_wrong_type(self) -> None:
+    def test_verify_access_token_wrong_type(self, refresh_token: str) -> None:
         """Test that refresh token fails verification as access token."""
-        data = {"sub": "123"}
-        refresh_token = create_refresh_token(data)
-
         with pytest.raises(InvalidTokenError, match="Invalid token type"):
             verify_token(refresh_token, token_type="access")
 
@@ -107,20 +110,14 @@ class TestAccessToken:
 class TestRefreshToken:
     """Tests for refresh token creation and verification."""
 
-    def test_create_refresh_token(self) -> None:
+    def test_create_refresh_token(self, refresh_token: str) -> None:
         """Test that create_refresh_token returns a valid JWT."""
-        data = {"sub": "123", "username": "testuser"}
-        token = create_refresh_token(data)
-
-        assert isinstance(token, str)
-        assert len(token) > 0
+        assert isinstance(refresh_token, str)
+        assert len(refresh_token) > 0
 
-    def test_verify_refresh_token(self) -> None:
+    def test_verify_refresh_token(self, refresh_token: str) -> None:
         """Test that verify_token correctly decodes refresh token."""
-        data = {"sub": "123", "username": "testuser"}
-        token = create_refresh_token(data)
-
-        payload = verify_token(token, token_type="refresh")
+        payload = verify_token(refresh_token, token_type="refresh")
 
         assert payload["sub"] == "123"
         assert payload["username"] == "testuser"
@@ -142,11 +139,8 @@ class TestRefreshToken:
         with pytest.raises(TokenExpiredError, match="Token has expired"):
             verify_token(token, token_type="refresh")
 
-    def test_verify_refresh_token_wrong_type(self) -> None:
+    def test_verify_refresh_token_wrong_type(self, access_token: str) -> None:
         """Test that access token fails verification as refresh token."""
-        data = {"sub": "123"}
-        access_token = create_access_token(data)
-
         with pytest.raises(InvalidTokenError, match="Invalid token type"):
             verify_token(access_token, token_type="refresh")
 
@@ -154,12 +148,9 @@ class TestRefreshToken:
 class TestDecodeWithoutVerification:
     """Tests for decode_token_without_verification."""
 
-    def test_decode_valid_token(self) -> None:
+    def test_decode_valid_token(self, access_token: str) -> None:
         """Test decoding a valid token without verification."""
-        data = {"sub": "123", "username": "testuser"}
-        token = create_access_token(data)
-
-        payload = decode_token_without_verification(token)
+        payload = decode_token_without_verification(access_token)
 
         assert payload["sub"] == "123"
         assert payload["username"] == "testuser"
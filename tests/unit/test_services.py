@@ -1,10 +1,12 @@
 """Tests for service layer."""
 
-from unittest.mock import AsyncMock, MagicMock
+from typing import Any, cast
+from unittest.mock import MagicMock
 
 import pytest
 
 from agent_marketplace_api.models import Agent, User
+from agent_marketplace_api.repositories import AgentRepository
 from agent_marketplace_api.schemas import AgentCreate, AgentUpdate
 from agent_marketplace_api.services.agent_service import (
     AgentAlreadyExistsError,
@@ -39,15 +41,98 @@ class TestAgentListResult:
         assert result.has_more is False
 
 
+class FakeSession:
+    """Records objects added to the session; flush is a no-op."""
+
+    def __init__(self) -> None:
+        self.added: list[Any] = []
+        self.info: dict[str, Any] = {}
+
+    def add(self, obj: Any) -> None:
+        self.added.append(obj)
+
+    async def flush(self) -> None:
+        pass
+
+
+class FakeAgentRepo:
+    """Minimal stand-in for AgentRepository that records each call.
+
+    Lookups return ``agent`` (or a list holding it); ``taken_slugs`` is what
+    slug_exists reports as in use and ``slug_suffixes`` what find_slug_suffixes
+    returns.
+    """
+
+    def __init__(self) -> None:
+        self.agent: Agent | None = None
+        self.taken_slugs: set[str] = set()
+        self.slug_suffixes: set[int] = set()
+        self.calls: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+        self.db = FakeSession()
+
+    def _record(self, name: str, *args: Any, **kwargs: Any) -> None:
+        self.calls.append((name, args, kwargs))
+
+    def _agents(self) -> list[Agent]:
+        return [self.agent] if self.agent else []
+
+    async def list_public(self, **kwargs: Any) -> list[Agent]:
+        self._record("list_public", **kwargs)
+        return self._agents()
+
+    async def count_public(self, **kwargs: Any) -> int:
+        self._record("count_public", **kwargs)
+        return len(self._agents())
+
+    async def find_by_slug(self, slug: str) -> Agent | None:
+        self._record("find_by_slug", slug)
+        return self.agent
+
+    async def get(self, agent_id: int) -> Agent | None:
+        self._record("get", agent_id)
+        return self.agent
+
+    async def find_by_author(self, author_id: int, **kwargs: Any) -> list[Agent]:
+        self._record("find_by_author", author_id, **kwargs)
+        return self._agents()
+
+    async def slug_exists(self, slug: str) -> bool:
+        self._record("slug_exists", slug)
+        return slug in self.taken_slugs
+
+    async def find_slug_suffixes(self, base_slug: str) -> set[int]:
+        self._record("find_slug_suffixes", base_slug)
+        return self.slug_suffixes
+
+    async def create(self, agent: Agent) -> Agent:
+        self._record("create", agent)
+        agent.id = 1
+        return agent
+
+    async def update(self, agent: Agent) -> Agent:
+        self._record("update", agent)
+        return agent
+
+    async def delete(self, agent: Agent) -> None:
+        self._record("delete", agent)
+
+    def called(self, name: str) -> list[tuple[tuple[Any, ...], dict[str, Any]]]:
+        """Arguments of every call made to ``name``."""
+        return [(args, kwargs) for called, args, kwargs in self.calls if called == name]
+
+
 class TestAgentService:
     """Tests for AgentService."""
 
     @pytest.fixture
-    def mock_repo(self) -> MagicMock:
-        """Create mock repository."""
-        repo = MagicMock()
-        repo.db = MagicMock()
-        return repo
+    def repo(self) -> FakeAgentRepo:
+        """Create fake repository."""
+        return FakeAgentRepo()
+
+    @pytest.fixture
+    def service(self, repo: FakeAgentRepo) -> AgentService:
+        """Create service backed by the fake repository."""
+        return AgentService(cast(AgentRepository, repo))
 
     @pytest.fixture
     def mock_user(self) -> User:
@@ -73,81 +158,74 @@ class TestAgentService:
         )
         return agent
 
+    @pytest.fixture
+    def other_user(self) -> User:
+        """Create a user who does not own the agent."""
+        return User(id=999, github_id=999, username="other", email="other@example.com")
+
     @pytest.mark.asyncio
-    async def test_list_agents(self, mock_repo: MagicMock, mock_agent: Agent) -> None:
+    async def test_list_agents(
+        self, service: AgentService, repo: FakeAgentRepo, mock_agent: Agent
+    ) -> None:
         """Test listing agents."""
-        mock_repo.list_public = AsyncMock(return_value=[mock_agent])
-        mock_repo.count_public = AsyncMock(return_value=1)
+        repo.agent = mock_agent
 
-        service = AgentService(mock_repo)
         result = await service.list_agents(limit=20, offset=0)
 
         assert len(result.items) == 1
         assert result.total == 1
-        mock_repo.list_public.assert_called_once()
+        assert len(repo.called("list_public")) == 1
 
     @pytest.mark.asyncio
-    async def test_list_agents_with_category(self, mock_repo: MagicMock) -> None:
+    async def test_list_agents_with_category(
+        self, service: AgentService, repo: FakeAgentRepo
+    ) -> None:
         """Test listing agents with category filter."""
-        mock_repo.list_public = AsyncMock(return_value=[])
-        mock_repo.count_public = AsyncMock(return_value=0)
-
-        service = AgentService(mock_repo)
         await service.list_agents(category="testing")
 
-        mock_repo.list_public.assert_called_once_with(
-            limit=20, offset=0, category="testing", sort_by="created_at"
-        )
+        assert repo.called("list_public") == [
+            ((), {"limit": 20, "offset": 0, "category": "testing", "sort_by": "created_at"})
+        ]
 
     @pytest.mark.asyncio
-    async def test_get_agent_found(self, mock_repo: MagicMock, mock_agent: Agent) -> None:
+    async def test_get_agent_found(
+        self, service: AgentService, repo: FakeAgentRepo, mock_agent: Agent
+    ) -> None:
         """Test getting agent by slug when it exists."""
-        mock_repo.find_by_slug = AsyncMock(return_value=mock_agent)
+        repo.agent = mock_agent
 
-        service = AgentService(mock_repo)
         result = await service.get_agent("test-agent")
 
         assert result.slug == "test-agent"
 
     @pytest.mark.asyncio
-    async def test_get_agent_not_found(self, mock_repo: MagicMock) -> None:
+    async def test_get_agent_not_found(self, service: AgentService) -> None:
         """Test getting agent raises error when not found."""
-        mock_repo.find_by_slug = AsyncMock(return_value=None)
-
-        service = AgentService(mock_repo)
-
         with pytest.raises(AgentNotFoundError):
             await service.get_agent("nonexistent")
 
     @pytest.mark.asyncio
-    async def test_get_agent_by_id_found(self, mock_repo: MagicMock, mock_agent: Agent) -> None:
+    async def test_get_agent_by_id_found(
+        self, service: AgentService, repo: FakeAgentRepo, mock_agent: Agent
+    ) -> None:
         """Test getting agent by ID when it exists."""
-        mock_repo.get = AsyncMock(return_value=mock_agent)
+        repo.agent = mock_agent
 
-        service = AgentService(mock_repo)
         result = await service.get_agent_by_id(1)
 
         assert result.id == 1
 
     @pytest.mark.asyncio
-    async def test_get_agent_by_id_not_found(self, mock_repo: MagicMock) -> None:
+    async def test_get_agent_by_id_not_found(self, service: AgentService) -> None:
         """Test getting agent by ID raises error when not found."""
-        mock_repo.get = AsyncMock(return_value=None)
-
-        service = AgentService(mock_repo)
-
         with pytest.raises(AgentNotFoundError):
             await service.get_agent_by_id(99999)
 
     @pytest.mark.asyncio
-    async def test_create_agent(self, mock_repo: MagicMock, mock_user: User) -> None:
+    async def test_create_agent(
+        self, service: AgentService, repo: FakeAgentRepo, mock_user: User
+    ) -> None:
         """Test creating a new agent."""
-        mock_repo.slug_exists = AsyncMock(return_value=False)
-        mock_repo.create = AsyncMock(side_effect=lambda a: setattr(a, "id", 1) or a)
-        mock_repo.db.add = MagicMock()
-        mock_repo.db.flush = AsyncMock()
-
-        service = AgentService(mock_repo)
         data = AgentCreate(
             name="New Agent",
             description="A brand new agent",
@@ -159,20 +237,16 @@ class TestAgentService:
 
         assert result.name == "New Agent"
         assert result.slug == "new-agent"
-        mock_repo.create.assert_called_once()
+        assert len(repo.called("create")) == 1
+        assert repo.called("find_slug_suffixes") == []
 
     @pytest.mark.asyncio
     async def test_create_agent_with_duplicate_slug(
-        self, mock_repo: MagicMock, mock_user: User
+        self, service: AgentService, repo: FakeAgentRepo, mock_user: User
     ) -> None:
         """Test creating agent generates unique slug when duplicate exists."""
-        # First call returns True (slug exists), second returns False
-        mock_repo.slug_exists = AsyncMock(side_effect=[True, False])
-        mock_repo.create = AsyncMock(side_effect=lambda a: setattr(a, "id", 1) or a)
-        mock_repo.db.add = MagicMock()
-        mock_repo.db.flush = AsyncMock()
-
-        service = AgentService(mock_repo)
+        repo.taken_slugs = {"test-agent"}
+        repo.slug_suffixes = {2}
         data = AgentCreate(
             name="Test Agent",
             description="A test agent description",
@@ -183,16 +257,14 @@ class TestAgentService:
         result = await service.create_agent(data, mock_user, "storage/key")
 
         assert result.slug == "test-agent-1"
+        assert repo.called("find_slug_suffixes") == [(("test-agent",), {})]
 
     @pytest.mark.asyncio
     async def test_update_agent_success(
-        self, mock_repo: MagicMock, mock_user: User, mock_agent: Agent
+        self, service: AgentService, repo: FakeAgentRepo, mock_user: User, mock_agent: Agent
     ) -> None:
         """Test updating agent metadata."""
-        mock_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_repo.update = AsyncMock(return_value=mock_agent)
-
-        service = AgentService(mock_repo)
+        repo.agent = mock_agent
         data = AgentUpdate(description="Updated description")
 
         result = await service.update_agent("test-agent", data, mock_user)
@@ -200,13 +272,11 @@ class TestAgentService:
         assert result.description == "Updated description"
 
     @pytest.mark.asyncio
-    async def test_update_agent_not_owner(self, mock_repo: MagicMock, mock_agent: Agent) -> None:
+    async def test_update_agent_not_owner(
+        self, service: AgentService, repo: FakeAgentRepo, mock_agent: Agent, other_user: User
+    ) -> None:
         """Test updating agent fails when user is not owner."""
-        mock_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-
-        other_user = User(id=999, github_id=999, username="other", email="other@example.com")
-
-        service = AgentService(mock_repo)
+        repo.agent = mock_agent
         data = AgentUpdate(description="Updated description text")
 
         with pytest.raises(AgentPermissionError):
@@ -214,13 +284,10 @@ class TestAgentService:
 
     @pytest.mark.asyncio
     async def test_update_agent_partial(
-        self, mock_repo: MagicMock, mock_user: User, mock_agent: Agent
+        self, service: AgentService, repo: FakeAgentRepo, mock_user: User, mock_agent: Agent
     ) -> None:
         """Test updating agent with partial data."""
-        mock_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_repo.update = AsyncMock(return_value=mock_agent)
-
-        service = AgentService(mock_repo)
+        repo.agent = mock_agent
         data = AgentUpdate(name="New Name", is_public=False)
 
         await service.update_agent("test-agent", data, mock_user)
@@ -230,61 +297,61 @@ class TestAgentService:
 
     @pytest.mark.asyncio
     async def test_delete_agent_success(
-        self, mock_repo: MagicMock, mock_user: User, mock_agent: Agent
+        self, service: AgentService, repo: FakeAgentRepo, mock_user: User, mock_agent: Agent
     ) -> None:
         """Test deleting an agent."""
-        mock_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-        mock_repo.delete = AsyncMock()
+        repo.agent = mock_agent
 
-        service = AgentService(mock_repo)
         await service.delete_agent("test-agent", mock_user)
 
-        mock_repo.delete.assert_called_once_with(mock_agent)
+        assert repo.called("delete") == [((mock_agent,), {})]
 
     @pytest.mark.asyncio
-    async def test_delete_agent_not_owner(self, mock_repo: MagicMock, mock_agent: Agent) -> None:
+    async def test_delete_agent_not_owner(
+        self, service: AgentService, repo: FakeAgentRepo, mock_agent: Agent, other_user: User
+    ) -> None:
         """Test deleting agent fails when user is not owner."""
-        mock_repo.find_by_slug = AsyncMock(return_value=mock_agent)
-
-        other_user = User(id=999, github_id=999, username="other", email="other@example.com")
-
-        service = AgentService(mock_repo)
+        repo.agent = mock_agent
 
         with pytest.raises(AgentPermissionError):
             await service.delete_agent("test-agent", other_user)
 
     @pytest.mark.asyncio
-    async def test_get_user_agents(self, mock_repo: MagicMock, mock_agent: Agent) -> None:
+    async def test_get_user_agents(
+        self, service: AgentService, repo: FakeAgentRepo, mock_agent: Agent
+    ) -> None:
         """Test getting all agents by a user."""
-        mock_repo.find_by_author = AsyncMock(return_value=[mock_agent])
+        repo.agent = mock_agent
 
-        service = AgentService(mock_repo)
         result = await service.get_user_agents(1)
 
         assert len(result) == 1
-        mock_repo.find_by_author.assert_called_once_with(1, limit=20, offset=0)
+        assert repo.called("find_by_author") == [((1,), {"limit": 20, "offset": 0})]
 
-    def test_generate_slug_simple(self, mock_repo: MagicMock) -> None:
+    def test_generate_slug_simple(self, service: AgentService) -> None:
         """Test slug generation from simple name."""
-        service = AgentService(mock_repo)
         slug = service._generate_slug("Test Agent")
 
         assert slug == "test-agent"
 
-    def test_generate_slug_special_chars(self, mock_repo: MagicMock) -> None:
+    def test_generate_slug_special_chars(self, service: AgentService) -> None:
         """Test slug generation removes special characters."""
-        service = AgentService(mock_repo)
         slug = service._generate_slug("Test! Agent? #1")
 
         assert slug == "test-agent-1"
 
-    def test_generate_slug_multiple_spaces(self, mock_repo: MagicMock) -> None:
+    def test_generate_slug_multiple_spaces(self, service: AgentService) -> None:
         """Test slug generation handles multiple spaces."""
-        service = AgentService(mock_repo)
         slug = service._generate_slug("Test   Agent")
 
         assert slug == "test-agent"
 
+    def test_generate_slug_keeps_word_characters(self, service: AgentService) -> None:
+        """Test slug generation drops apostrophes but keeps underscores."""
+        slug = service._generate_slug("Bob's code_helper")
+
+        assert slug == "bobs-code_helper"
+
 
 class TestExceptions:
     """Tests for service exceptions."""
@@ -1,6 +1,9 @@
 """Unit tests for storage module."""
 
 import io
+import threading
+import time
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -25,16 +28,14 @@ def mock_s3_client() -> MagicMock:
 @pytest.fixture
 def storage_service(mock_s3_client: MagicMock) -> StorageService:
     """Create a storage service with mocked S3 client."""
-    with patch("agent_marketplace_api.storage.boto3.client", return_value=mock_s3_client):
-        service = StorageService(
-            endpoint_url="http://localhost:9000",
-            access_key="testkey",
-            secret_key="testsecret",
-            bucket="test-bucket",
-            region="us-east-1",
-        )
-        service._client = mock_s3_client
-        return service
+    return StorageService(
+        endpoint_url="http://localhost:9000",
+        access_key="testkey",
+        secret_key="testsecret",
+        bucket="test-bucket",
+        region="us-east-1",
+        client=mock_s3_client,
+    )
 
 
 class TestStorageServiceInit:
@@ -68,6 +69,23 @@ class TestStorageServiceInit:
             assert service.bucket is not None
             mock_client.assert_called_once()
 
+    def test_init_with_injected_client(self, mock_s3_client: MagicMock) -> None:
+        """Test an injected client is used instead of building one."""
+        with patch("agent_marketplace_api.storage.boto3.client") as mock_client:
+            service = StorageService(bucket="b", client=mock_s3_client)
+
+        assert service._client is mock_s3_client
+        mock_client.assert_not_called()
+
+    def test_init_sizes_connection_pool(self) -> None:
+        """Test the client pool is sized from settings with standard retries."""
+        with patch("agent_marketplace_api.storage.boto3.client") as mock_client:
+            StorageService()
+
+        config = mock_client.call_args.kwargs["config"]
+        assert config.max_pool_connections == 64
+        assert config.retries == {"mode": "standard"}
+
 
 class TestUploadFile:
     """Tests for upload_file method."""
@@ -136,6 +154,133 @@ class TestUploadFile:
                 file_data=b"content",
             )
 
+    @pytest.mark.asyncio
+    async def test_multipart_upload_parallel(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+    ) -> None:
+        """Test large byte payloads are sent as numbered parts, then completed."""
+        part = 8 * 1024 * 1024
+        data = b"a" * part + b"b" * part + b"c"
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "up1"}
+        mock_s3_client.upload_part.side_effect = lambda **kw: {"ETag": f'"p{kw["PartNumber"]}"'}
+        mock_s3_client.complete_multipart_upload.return_value = {"ETag": '"abc-3"'}
+
+        result = await storage_service.upload_file("big.zip", data, "application/zip")
+
+        assert result.size_bytes == len(data)
+        assert result.etag == "abc-3"
+        mock_s3_client.put_object.assert_not_called()
+        mock_s3_client.create_multipart_upload.assert_called_once_with(
+            Bucket="test-bucket", Key="big.zip", ContentType="application/zip"
+        )
+        bodies = {
+            call.kwargs["PartNumber"]: call.kwargs["Body"]
+            for call in mock_s3_client.upload_part.call_args_list
+        }
+        assert b"".join(bodies[n] for n in sorted(bodies)) == data
+        mock_s3_client.complete_multipart_upload.assert_called_once_with(
+            Bucket="test-bucket",
+            Key="big.zip",
+            UploadId="up1",
+            MultipartUpload={
+                "Parts": [
+                    {"ETag": '"p1"', "PartNumber": 1},
+                    {"ETag": '"p2"', "PartNumber": 2},
+                    {"ETag": '"p3"', "PartNumber": 3},
+                ]
+            },
+        )
+
+    @pytest.mark.asyncio
+    async def test_multipart_upload_part_failure_aborts(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+    ) -> None:
+        """Test a failed part aborts the multipart upload and raises UploadError."""
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "up1"}
+        mock_s3_client.upload_part.side_effect = ClientError(
+            {"Error": {"Code": "500", "Message": "Internal error"}},
+            "UploadPart",
+        )
+
+        with pytest.raises(UploadError, match="Failed to upload file"):
+            await storage_service.upload_file("big.zip", b"x" * (16 * 1024 * 1024 + 1))
+
+        mock_s3_client.abort_multipart_upload.assert_called_once_with(
+            Bucket="test-bucket", Key="big.zip", UploadId="up1"
+        )
+        mock_s3_client.complete_multipart_upload.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_multipart_upload_unexpected_error_aborts(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+    ) -> None:
+        """Test a non-S3 error still aborts the upload and propagates unchanged."""
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "up1"}
+        mock_s3_client.upload_part.side_effect = RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await storage_service.upload_file("big.zip", b"x" * (16 * 1024 * 1024 + 1))
+
+        mock_s3_client.abort_multipart_upload.assert_called_once_with(
+            Bucket="test-bucket", Key="big.zip", UploadId="up1"
+        )
+
+    @pytest.mark.asyncio
+    async def test_multipart_upload_concurrency_capped(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+    ) -> None:
+        """Test no more than _UPLOAD_CONCURRENCY parts are uploaded at once."""
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def upload_part(**kwargs: Any) -> dict[str, str]:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return {"ETag": f'"p{kwargs["PartNumber"]}"'}
+
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "up1"}
+        mock_s3_client.upload_part.side_effect = upload_part
+        mock_s3_client.complete_multipart_upload.return_value = {"ETag": '"abc-6"'}
+
+        with (
+            patch("agent_marketplace_api.storage._UPLOAD_PART_SIZE", 4),
+            patch("agent_marketplace_api.storage._UPLOAD_CONCURRENCY", 2),
+        ):
+            await storage_service._upload_multipart("big.zip", b"x" * 24, "application/zip")
+
+        assert mock_s3_client.upload_part.call_count == 6
+        assert peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_multipart_upload_create_failure(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+    ) -> None:
+        """Test failing to start a multipart upload raises UploadError."""
+        mock_s3_client.create_multipart_upload.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied", "Message": "Denied"}},
+            "CreateMultipartUpload",
+        )
+
+        with pytest.raises(UploadError, match="Failed to upload file"):
+            await storage_service.upload_file("big.zip", b"x" * (16 * 1024 * 1024 + 1))
+
+        mock_s3_client.upload_part.assert_not_called()
+
 
 class TestDownloadFile:
     """Tests for download_file method."""
@@ -157,8 +302,109 @@ class TestDownloadFile:
         mock_s3_client.get_object.assert_called_once_with(
             Bucket="test-bucket",
             Key="test/file.zip",
+            Range="bytes=0-8388607",
+        )
+
+    @pytest.mark.asyncio
+    async def test_download_large_file_in_ranges(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+    ) -> None:
+        """Test objects over one part are fetched as ordered byte ranges."""
+        part = 8 * 1024 * 1024
+        size = 2 * part + 10
+        content = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+
+        def get_object(**kwargs: str) -> dict[str, object]:
+            start, end = (int(n) for n in kwargs["Range"].removeprefix("bytes=").split("-"))
+            body = MagicMock()
+            body.read.return_value = content[start : end + 1]
+            return {"Body": body, "ContentRange": f"bytes {start}-{end}/{size}", "ETag": '"e1"'}
+
+        mock_s3_client.get_object.side_effect = get_object
+
+        result = await storage_service.download_file("big.zip")
+
+        assert result == content
+        calls = mock_s3_client.get_object.call_args_list
+        assert {call.kwargs["Range"] for call in calls} == {
+            f"bytes=0-{part - 1}",
+            f"bytes={part}-{2 * part - 1}",
+            f"bytes={2 * part}-{size - 1}",
+        }
+        assert all(call.kwargs["IfMatch"] == '"e1"' for call in calls[1:])
+
+    @pytest.mark.asyncio
+    async def test_download_concurrency_capped(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+    ) -> None:
+        """Test no more than _DOWNLOAD_CONCURRENCY byte ranges are fetched at once."""
+        size = 28
+        content = bytes(range(size))
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def get_object(**kwargs: str) -> dict[str, object]:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            start, end = (int(n) for n in kwargs["Range"].removeprefix("bytes=").split("-"))
+            body = MagicMock()
+            body.read.return_value = content[start : end + 1]
+            return {"Body": body, "ContentRange": f"bytes {start}-{end}/{size}", "ETag": '"e1"'}
+
+        mock_s3_client.get_object.side_effect = get_object
+
+        with (
+            patch("agent_marketplace_api.storage._DOWNLOAD_PART_SIZE", 4),
+            patch("agent_marketplace_api.storage._DOWNLOAD_CONCURRENCY", 2),
+        ):
+            result = await storage_service.download_file("big.zip")
+
+        assert result == content
+        assert mock_s3_client.get_object.call_count == 7
+        assert peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_download_empty_file(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+    ) -> None:
+        """Test an empty object, which rejects byte ranges, downloads as b""."""
+        mock_s3_client.get_object.side_effect = ClientError(
+            {"Error": {"Code": "InvalidRange", "Message": "Range not satisfiable"}},
+            "GetObject",
         )
 
+        assert await storage_service.download_file("empty.zip") == b""
+
+    @pytest.mark.asyncio
+    async def test_download_changed_during_ranges(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+    ) -> None:
+        """Test a part failing its IfMatch check raises StorageError."""
+        first = MagicMock()
+        first.read.return_value = b"x" * (8 * 1024 * 1024)
+        mock_s3_client.get_object.side_effect = [
+            {"Body": first, "ContentRange": "bytes 0-8388607/8388617", "ETag": '"e1"'},
+            ClientError(
+                {"Error": {"Code": "PreconditionFailed", "Message": "Changed"}}, "GetObject"
+            ),
+        ]
+
+        with pytest.raises(StorageError, match="Failed to download file"):
+            await storage_service.download_file("changing.zip")
+
     @pytest.mark.asyncio
     async def test_download_not_found(
         self,
@@ -206,7 +452,7 @@ class TestDownloadFile:
 
 
 class TestDeleteFile:
-    """Tests for delete_file method."""
+    """Tests for delete_file and delete_files methods."""
 
     @pytest.mark.asyncio
     async def test_delete_success(
@@ -239,6 +485,65 @@ class TestDeleteFile:
         with pytest.raises(StorageError, match="Failed to delete file"):
             await storage_service.delete_file("test/file.zip")
 
+    @pytest.mark.asyncio
+    async def test_bulk_delete(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+    ) -> None:
+        """Test bulk deletion sends one DeleteObjects request per 1000 keys."""
+        keys = [f"agents/{i}.zip" for i in range(2500)]
+        mock_s3_client.delete_objects.return_value = {}
+
+        await storage_service.delete_files(keys)
+
+        batches = [
+            call.kwargs["Delete"]["Objects"]
+            for call in mock_s3_client.delete_objects.call_args_list
+        ]
+        assert [len(batch) for batch in batches] == [1000, 1000, 500]
+        assert [obj["Key"] for batch in batches for obj in batch] == keys
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_empty(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+    ) -> None:
+        """Test bulk deletion of no keys makes no request."""
+        await storage_service.delete_files([])
+
+        mock_s3_client.delete_objects.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_partial_failure(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+    ) -> None:
+        """Test keys reported in Errors raise StorageError naming them."""
+        mock_s3_client.delete_objects.return_value = {
+            "Errors": [{"Key": "b.zip", "Code": "AccessDenied"}]
+        }
+
+        with pytest.raises(StorageError, match=r"b\.zip"):
+            await storage_service.delete_files(["a.zip", "b.zip"])
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_failure(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+    ) -> None:
+        """Test bulk delete request failure raises StorageError."""
+        mock_s3_client.delete_objects.side_effect = ClientError(
+            {"Error": {"Code": "500", "Message": "Error"}},
+            "DeleteObjects",
+        )
+
+        with pytest.raises(StorageError, match="Failed to delete files"):
+            await storage_service.delete_files(["a.zip"])
+
 
 class TestFileExists:
     """Tests for file_exists method."""
@@ -414,6 +719,27 @@ class TestPresignedUrls:
 
         assert result == "https://upload.url"
 
+    @pytest.mark.parametrize(
+        ("size_hint", "expected"),
+        [(8 * 1024 * 1024, None), (8 * 1024 * 1024 + 1, "https://upload.url")],
+        ids=["at_threshold", "over_threshold"],
+    )
+    @pytest.mark.asyncio
+    async def test_upload_via_presigned_threshold(
+        self,
+        storage_service: StorageService,
+        mock_s3_client: MagicMock,
+        size_hint: int,
+        expected: str | None,
+    ) -> None:
+        """Test only files over the threshold are steered to a presigned PUT."""
+        mock_s3_client.generate_presigned_url.return_value = "https://upload.url"
+
+        result = await storage_service.upload_via_presigned("test/new.zip", size_hint)
+
+        assert result == expected
+        assert mock_s3_client.generate_presigned_url.called is (expected is not None)
+
 
 class TestEnsureBucketExists:
     """Tests for ensure_bucket_exists method."""